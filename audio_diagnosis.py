@@ -2,21 +2,23 @@
 音声出力診断スクリプト
 """
 
-import pyttsx3
 import time
 
 def test_audio_output():
     print("=== 音声出力診断テスト ===")
     
+    # TTSエンジン関連は使用時に読み込む（スクリプトの起動を軽くする）
+    from src.audio_engine import get_engine, get_voices
+    
     try:
         # TTSエンジン初期化
-        engine = pyttsx3.init()
+        engine = get_engine()
         
         # 現在の設定表示
         print(f"音量: {engine.getProperty('volume')}")
         print(f"速度: {engine.getProperty('rate')}")
         
-        voices = engine.getProperty('voices')
+        voices = get_voices()
         current_voice = engine.getProperty('voice')
         print(f"現在の音声: {current_voice}")
         
@@ -2,21 +2,23 @@
 音声出力の詳細診断スクリプト
 """
 
-import pyttsx3
 import time
 
 def diagnose_audio_system():
     print("=== 音声システム詳細診断 ===")
     
+    # TTSエンジン関連は使用時に読み込む（スクリプトの起動を軽くする）
+    from src.audio_engine import get_engine, get_voices, get_voices_by_lang
+    
     try:
         # pyttsx3エンジンの初期化
         print("1. エンジン初期化中...")
-        engine = pyttsx3.init()
+        engine = get_engine()
         print("✅ エンジン初期化成功")
         
         # 音声の詳細設定を確認
         print("\n2. 現在の音声設定:")
-        voices = engine.getProperty('voices')
+        voices = get_voices()
         current_voice = engine.getProperty('voice')
         rate = engine.getProperty('rate')
         volume = engine.getProperty('volume')
@@ -43,11 +45,10 @@ def diagnose_audio_system():
         engine.setProperty('rate', 150)
         
         # 日本語音声を明示的に選択
-        for voice in voices:
-            if voice.languages and any('ja' in lang.lower() for lang in voice.languages):
-                engine.setProperty('voice', voice.id)
-                print(f"   日本語音声に設定: {voice.name}")
-                break
+        japanese_voice = get_voices_by_lang().get('ja')
+        if japanese_voice:
+            engine.setProperty('voice', japanese_voice.id)
+            print(f"   日本語音声に設定: {japanese_voice.name}")
         else:
             print("   日本語音声が見つかりません、デフォルトを使用")
         
@@ -6,17 +6,21 @@
 import time
 import signal
 import sys
+import re
 import threading
-from src.audio_input import AudioInputHandler
-from src.speech_recognizer import SpeechRecognizer
-from src.continuous_speech import ContinuousSpeechMonitor
-from src.gemini_client import GeminiClient
-from src.audio_output import AudioOutputHandler
+import queue
+import itertools
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from src.config_manager import ConfigManager
 from src.logger import VoiceAssistantLogger
 from src.performance_monitor import PerformanceMonitor
 
 
+# 追加コマンド録音を応答メッセージの再生終了より前倒しで開始する時間（ストリーム起動の遅延分）
+RECORD_START_LEAD_SECONDS = 0.15
+
+
 class VoiceAssistant:
     """音声アシスタントのメインクラス"""
     
@@ -24,6 +28,21 @@ class VoiceAssistant:
         """初期化"""
         print("=== 音声アシスタント起動中 ===")
         
+        # 後から生成するコンポーネント（初期化途中で失敗してもcleanup()で判定できるようにする）
+        self.performance_monitor = None
+        self.audio_optimizer = None
+        self.audio_processing_monitor = None
+        self.parallel_speech = None
+        self.gemini_client = None
+        self.audio_handler = None
+        self.audio_output = None
+        self.continuous_monitor = None
+        self.gemini_executor = None
+        self._cmd_executor = None
+        self._stop_event = threading.Event()  # 終了要求でメインループ・待機中の処理を即座に起こす
+        self.command_queue = None
+        self.system_messages = {}
+        
         # 設定管理初期化
         self.config = ConfigManager(config_path)
         
@@ -58,9 +77,6 @@ class VoiceAssistant:
             self.audio_processing_monitor = AudioProcessingMonitor(self.audio_optimizer)
             self.audio_processing_monitor.start_monitoring()
             print("🎛️ 動的音声品質調整システム有効")
-        else:
-            self.audio_optimizer = None
-            self.audio_processing_monitor = None
         
         # 並列音声認識システム初期化
         if optimization_config.get("parallel_recognition", False):
@@ -69,13 +85,13 @@ class VoiceAssistant:
                 language=speech_config.get("language", "ja-JP")
             )
             print("🎙️ 並列音声認識システム有効")
-        else:
-            self.parallel_speech = None
         
         # コンポーネント初期化
         # VAD設定を取得
         vad_config = self.config.get_vad_config()
         
+        # 各サブシステムは使用直前に読み込む（起動時のインポートを必要最小限にする）
+        from src.audio_input import AudioInputHandler
         self.audio_handler = AudioInputHandler(
             recording_duration=audio_input_config.get("recording_duration", 5)
         )
@@ -86,38 +102,69 @@ class VoiceAssistant:
         self.vad_min_duration = vad_config.get("min_duration", 0.3)
         self.vad_post_silence_duration = vad_config.get("post_silence_duration", 0.8)
         
+        from src.speech_recognizer import SpeechRecognizer
         self.speech_recognizer = SpeechRecognizer(
             language=speech_config.get("language", "ja-JP")
         )
+        from src.gemini_client import GeminiClient
         self.gemini_client = GeminiClient(
             debug=gemini_config.get("debug", False),
             timeout=gemini_config.get("timeout", 30),
             optimized_timeout=gemini_config.get("optimized_timeout", 15),
             enable_optimization=gemini_config.get("enable_optimization", True),
-            model=gemini_config.get("model", "gemini-2.5-flash")
+            model=gemini_config.get("model", "gemini-2.5-flash"),
+            check_cli=False  # CLI確認は起動案内の再生中にバックグラウンドで実行
         )
         
         # 音声出力（キャッシュ機能を有効化）
-        cache_phrases = optimization_config.get("cache_phrases", []) if optimization_config.get("pregenerated_cache", False) else None
+        self.cache_phrases = optimization_config.get("cache_phrases", []) if optimization_config.get("pregenerated_cache", False) else None
+        from src.audio_output import AudioOutputHandler
         self.audio_output = AudioOutputHandler(
             rate=audio_output_config.get("rate", 180),
             volume=audio_output_config.get("volume", 0.8),
             voice_id=audio_output_config.get("voice_id"),
             max_text_length=audio_output_config.get("max_text_length", 300),
-            cache_phrases=cache_phrases,
+            cache_phrases=self.cache_phrases,
             enable_sound_effects=audio_output_config.get("enable_sound_effects", True),
             sound_effect_volume=audio_output_config.get("sound_effect_volume", 0.5)
         )
         
         # 状態管理
-        self.is_running = True
         self.wake_words = self.config.get_wake_words()
+        # 監視開始時の案内文（ウェイクワード一覧は変わらないため一度だけ組み立てる）
+        self._wake_print = (
+            "📡 常時ウェイクワード監視開始\n"
+            f"ウェイクワード: {', '.join(self.wake_words)}\n"
+            "いつでもウェイクワードを話しかけてください...\n"
+        )
         self.exit_commands = self.config.get_exit_commands()
         self.performance_commands = self.config.get("performance_commands", [])
         self.optimization_commands = self.config.get("optimization_commands", [])
+        # コマンド照合用の正規表現（コマンドごとの小文字化・ループを避ける）
+        self._command_re = self._compile_command_keywords({
+            "exit": self.exit_commands,
+            "performance": self.performance_commands,
+            "optimization": self.optimization_commands,
+        })
+        # 特殊コマンドの種類 → ハンドラ（先頭ほど優先）
+        self._command_handlers = (
+            ("exit", self._handle_exit_command),
+            ("performance", self._handle_performance_command),
+            ("optimization", self._handle_optimization_command),
+        )
+        self._wake_set = frozenset(word.lower() for word in self.wake_words)
+        # システムメッセージ（デフォルト補完済み）。コールバックで頻繁に使うものは属性に展開
         self.system_messages = self.config.get_system_messages()
+        self.ready_message = self.system_messages["ready_message"]
+        self.thinking_message = self.system_messages["thinking_message"]
+        
+        # 音声処理カーネルのJITコンパイル・音声エンジンのウォームアップ・定型メッセージの事前合成
+        # （初回の検知・読み上げの遅延を解消。完了前の呼び出しはNumPy実装・通常の合成で処理される）
+        self.warmup_thread = threading.Thread(target=self._warmup_audio_output, daemon=True)
+        self.warmup_thread.start()
         
         # 常時音声監視システム初期化
+        from src.continuous_speech import ContinuousSpeechMonitor
         self.continuous_monitor = ContinuousSpeechMonitor(
             language=speech_config.get("language", "ja-JP"),
             wake_words=self.wake_words,
@@ -128,16 +175,73 @@ class VoiceAssistant:
         # 重複防止設定を反映
         self.continuous_monitor.wake_word_cooldown = self.wake_word_cooldown
         self.continuous_monitor.audio_output_suppression_time = self.audio_output_suppression_time
+        self.continuous_monitor.gate_threshold = optimization_config.get("gate_threshold", 150)
         
         # 処理状態管理
-        self.is_processing_command = False
-        self.command_lock = threading.Lock()
-        self.last_processed_command = ""
-        self.last_command_time = 0
+        # ウェイクワードのコールバックは監視スレッドからのみ呼ばれるため、ロックは使わない
+        self._processing = threading.Event()  # 処理中フラグ
+        self._last_command = ("", 0.0)  # (最後に処理したコマンド, 時刻)。タプルごと置き換えて一貫性を保つ
+        
+        # Gemini問い合わせ用スレッドプール（待機中に「少々お待ちください」を再生するため）
+        self.gemini_executor = ThreadPoolExecutor(max_workers=2)
+        self.gemini_result_timeout = gemini_config.get("timeout", 30) * 2 + 5
+        
+        # 追加コマンド待機用ワーカー（ウェイクワードごとにスレッドを生成しない）
+        self._cmd_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cmd-wait")
+        
+        # コマンド処理パイプライン（Gemini問い合わせ・音声出力をマイク監視から分離）
+        self.command_queue = queue.Queue()
+        self.command_worker = threading.Thread(target=self._command_worker_loop, daemon=True)
         
         self.logger.log_startup()
         print("初期化完了！")
     
+    @staticmethod
+    def _compile_command_keywords(keywords_by_kind: dict):
+        """
+        種類ごとのキーワードリストを名前付きグループ付きの1つの正規表現にまとめる（大文字小文字を区別しない）
+        
+        Args:
+            keywords_by_kind: 種類名 → キーワードのリスト
+            
+        Returns:
+            コンパイル済み正規表現（キーワードが1つもない場合はNone）
+        """
+        groups = [
+            f"(?P<{kind}>" + "|".join(re.escape(word) for word in words) + ")"
+            for kind, words in keywords_by_kind.items() if words
+        ]
+        if not groups:
+            return None
+        return re.compile("|".join(groups), re.IGNORECASE)
+    
+    def _match_command_kinds(self, command: str) -> frozenset:
+        """
+        コマンドに含まれる特殊コマンドの種類を1回の走査で取得
+        
+        Args:
+            command: 認識されたコマンド
+            
+        Returns:
+            含まれる種類名（"exit" / "performance" / "optimization"）の集合
+        """
+        if self._command_re is None:
+            return frozenset()
+        return frozenset(match.lastgroup for match in self._command_re.finditer(command))
+    
+    def _warmup_audio_output(self):
+        """音声処理カーネルのJITコンパイル、音声エンジンのウォームアップと定型メッセージの事前合成"""
+        from src.dsp_kernels import warmup_kernels
+        warmup_kernels()
+        
+        self.audio_output.warmup()
+        
+        # 設定ファイルで上書き・追加された *_message も含めて全て事前合成
+        self.audio_output.precache_phrases([
+            *self.system_messages.values(),
+            *(self.cache_phrases or []),
+        ])
+    
     def _on_wake_word_detected(self, detected_text: str, extracted_command: str):
         """
         ウェイクワード検知時のコールバック
@@ -146,71 +250,96 @@ class VoiceAssistant:
             detected_text: 検知されたテキスト
             extracted_command: 抽出されたコマンド
         """
-        with self.command_lock:
-            if self.is_processing_command:
-                print("🔄 処理中のため、ウェイクワードを無視します")
-                return
-            
-            # 重複コマンド検知防止
-            current_time = time.time()
-            if (extracted_command == self.last_processed_command and 
-                current_time - self.last_command_time < self.command_cooldown):
-                print(f"🔄 同じコマンドのクールダウン中 ({self.command_cooldown}秒): '{extracted_command}'")
-                return
-            
-            self.is_processing_command = True
-            self.last_processed_command = extracted_command
-            self.last_command_time = current_time
+        # 処理中なら即座に破棄
+        if self._processing.is_set():
+            self.logger.debug("処理中のため、ウェイクワードを無視します")
+            return
+        
+        # 重複コマンド検知防止
+        current_time = time.monotonic()
+        last_command, last_time = self._last_command
+        if extracted_command == last_command and current_time - last_time < self.command_cooldown:
+            self.logger.debug("同じコマンドのクールダウン中 (%s秒): '%s'", self.command_cooldown, extracted_command)
+            return
+        
+        self._processing.set()
+        self._last_command = (extracted_command, current_time)
         
+        # 前の応答を再生中なら打ち切る（バージイン、即座に行う）
+        self.audio_output.interrupt()
+        
+        # 残りの処理はワーカーで行い、監視スレッドはすぐに音声検知へ戻る
+        try:
+            self._cmd_executor.submit(self._handle_wake, detected_text, extracted_command)
+        except RuntimeError:
+            # 終了処理でワーカーが停止済み
+            self._processing.clear()
+    
+    def _handle_wake(self, detected_text: str, extracted_command: str):
+        """
+        ウェイクワード検知後の処理（コマンド投入または応答メッセージ再生と追加入力待機）
+        
+        Args:
+            detected_text: 検知されたテキスト
+            extracted_command: 抽出されたコマンド
+        """
         try:
             # パフォーマンス測定開始
             session_id = self.performance_monitor.start_session(f"ウェイクワード: '{detected_text}'")
             
-            print(f"🎤 ウェイクワード検知: '{detected_text}'")
             self.logger.log_wake_word_detected(detected_text, extracted_command)
             
+            # 「ルクス、ルクス」のようにウェイクワードだけが残った場合はコマンドなしとして扱う
+            if extracted_command.strip().lower() in self._wake_set:
+                extracted_command = ""
+            
             if extracted_command.strip():
                 # コマンドが同時に検知された場合
-                print(f"同時に検知されたコマンド: '{extracted_command}'")
-                self.process_command(extracted_command)
+                self._enqueue_command(extracted_command)
             else:
                 # コマンドが検知されていない場合、追加入力を待つ
-                ready_msg = self.system_messages.get("ready_message", "はい、何でしょうか？")
+                ready_msg = self.ready_message
+                
+                # 応答メッセージの終了予定時刻（録音開始をこれに合わせる）
+                ready_end = time.monotonic() + self.audio_output.phrase_duration(ready_msg)
                 
                 # 音声出力ステップ計測
                 step = self.performance_monitor.start_step("ready_message_output")
                 try:
-                    # 音声出力中は音声検知を停止
+                    # 応答メッセージの再生から追加コマンドの録音終了まで常時監視の音声検知を停止
+                    # （再開は_wait_for_additional_commandが録音を終えた時点で行う）
                     self.continuous_monitor.set_audio_output_active(True)
-                    self.audio_output.speak_text(ready_msg, blocking=False)
+                    self.audio_output.speak_cached(ready_msg, blocking=False)
                     self.performance_monitor.finish_step("ready_message_output", True)
                 except Exception as e:
                     self.performance_monitor.finish_step("ready_message_output", False, str(e))
-                    raise
-                finally:
-                    # 音声出力完了後は音声検知を再開
-                    time.sleep(0.3)  # 短めの待機時間
                     self.continuous_monitor.set_audio_output_active(False)
+                    raise
                 
-                # 追加コマンド入力待機（非ブロッキング）
-                threading.Thread(target=self._wait_for_additional_command, daemon=True).start()
+                # 追加コマンド入力待機（すぐに投入し、再生の終わり際に録音を開始）
+                self._cmd_executor.submit(self._wait_for_additional_command, ready_end)
         
         except Exception as e:
-            import traceback
             print(f"ウェイクワード処理エラー: {e}")
             print(f"詳細エラー情報: {traceback.format_exc()}")
             self.performance_monitor.finish_session(False)
         finally:
-            with self.command_lock:
-                self.is_processing_command = False
+            self._processing.clear()
     
-    def _wait_for_additional_command(self):
+    def _wait_for_additional_command(self, ready_end: float = 0.0):
         """
         ウェイクワード検知後の追加コマンド待機
+        
+        Args:
+            ready_end: 応答メッセージの再生終了予定時刻（time.monotonic()基準、0なら即座に録音）
         """
         try:
-            print("\n--- 追加コマンド入力待機 ---")
-            print("ご用件をお話しください（10秒以内）...")
+            # 録音デバイスの起動時間分だけ早めて、再生終了と同時に録音が始まるようにする
+            remaining = ready_end - RECORD_START_LEAD_SECONDS - time.monotonic()
+            if remaining > 0 and self._stop_event.wait(remaining):
+                return
+            
+            self.logger.debug("追加コマンド入力待機（最大%s秒）", self.vad_max_duration)
             
             # 音声入力ステップ計測（VAD使用）
             step = self.performance_monitor.start_step("audio_input")
@@ -241,21 +370,52 @@ class VoiceAssistant:
                     raise
                 
                 if text:
-                    print(f"📝 認識されたコマンド: '{text}'")
-                    self.process_command(text)
+                    self.logger.debug("認識されたコマンド: '%s'", text)
+                    self._enqueue_command(text)
                 else:
-                    print("音声を認識できませんでした")
+                    self.logger.debug("音声を認識できませんでした")
                     self.performance_monitor.finish_session(False)
             else:
-                print("音声データがありません")
+                self.logger.debug("音声データがありません")
                 self.performance_monitor.finish_session(False)
         
         except Exception as e:
             print(f"追加コマンド入力エラー: {e}")
             self.performance_monitor.finish_session(False)
         finally:
-            with self.command_lock:
-                self.is_processing_command = False
+            # 録音が終わったので常時監視の音声検知を再開
+            self.continuous_monitor.set_audio_output_active(False)
+            self._processing.clear()
+    
+    def _enqueue_command(self, command: str):
+        """
+        コマンドを処理キューに投入（ウェイクワード監視はすぐに再開される）
+        
+        Args:
+            command: 認識されたコマンド
+        """
+        self.command_queue.put(command)
+    
+    def _command_worker_loop(self):
+        """
+        コマンド処理ワーカー
+        
+        キューからコマンドを取り出してGemini問い合わせ・音声出力を行う。
+        マイク監視とは別スレッドで動作するため、応答の再生中も次のウェイクワードを受け付けられる
+        """
+        while not self._stop_event.is_set():
+            # 終了時はstop()が終了マーカーを投入するため、タイムアウトなしで待機
+            command = self.command_queue.get()
+            
+            if command is None:  # 終了マーカー
+                break
+            
+            try:
+                self.process_command(command)
+            except Exception as e:
+                print(f"コマンド処理エラー: {e}")
+                self.logger.log_error("コマンド処理エラー", e)
+                self.performance_monitor.finish_session(False)
     
     # 旧来の音声入力メソッド（常時監視により不要）
     # def listen_for_command(self, initial_command: str = "") -> str:
@@ -275,212 +435,300 @@ class VoiceAssistant:
         if not self.performance_monitor.current_session:
             self.performance_monitor.start_session(f"直接コマンド: '{command}'")
         
-        # 終了コマンドのチェック
-        if any(word in command.lower() for word in self.exit_commands):
-            print("👋 音声アシスタントを終了します")
-            
-            # 終了メッセージ出力ステップ計測
-            step = self.performance_monitor.start_step("shutdown_message_output")
-            try:
-                shutdown_msg = self.system_messages.get("shutdown_message", "音声アシスタントを終了します。お疲れ様でした。")
-                self.audio_output.speak_text(shutdown_msg, blocking=True)
-                self.performance_monitor.finish_step("shutdown_message_output", True)
-            except Exception as e:
-                self.performance_monitor.finish_step("shutdown_message_output", False, str(e))
-            
-            self.logger.log_shutdown()
-            self.performance_monitor.finish_session(True)
-            self.is_running = False
-            return
-
-        # パフォーマンス統計表示コマンドのチェック
-        if any(word in command.lower() for word in self.performance_commands):
-            print("📊 パフォーマンス統計を表示します")
-            self.performance_monitor.print_performance_report()
-            
-            # 最適化ガイドも表示
-            self.performance_monitor.print_optimization_guide()
-            
-            # 統計音声出力ステップ計測
-            step = self.performance_monitor.start_step("stats_audio_output")
-            try:
-                stats_msg = "パフォーマンス統計を表示しました。詳細はコンソールをご確認ください。"
-                self.audio_output.speak_text(stats_msg, blocking=True)
-                self.performance_monitor.finish_step("stats_audio_output", True)
-            except Exception as e:
-                self.performance_monitor.finish_step("stats_audio_output", False, str(e))
-            
-            self.performance_monitor.finish_session(True)
-            return
-
-        # 最適化コマンドのチェック
-        if any(word in command.lower() for word in self.optimization_commands):
-            print("⚙️ システム最適化を実行します")
-            
-            # 最適化ステップ計測
-            step = self.performance_monitor.start_step("auto_optimization")
-            try:
-                result = self.performance_monitor.apply_auto_optimization(self.config)
-                
-                if result["status"] == "success":
-                    self.performance_monitor.finish_step("auto_optimization", True)
-                    print(f"✅ 最適化完了 (優先度: {result['priority']})")
-                    print("適用された変更:")
-                    for change in result["changes"]:
-                        print(f"   ・{change}")
-                    
-                    # 最適化音声出力
-                    step = self.performance_monitor.start_step("optimization_audio_output")
-                    try:
-                        opt_msg = f"システム最適化を完了しました。{len(result['changes'])}項目の設定を更新しました。"
-                        self.audio_output.speak_text(opt_msg, blocking=True)
-                        self.performance_monitor.finish_step("optimization_audio_output", True)
-                    except Exception as e:
-                        self.performance_monitor.finish_step("optimization_audio_output", False, str(e))
-                    
-                    print("\n🔄 設定を反映するにはアプリケーションを再起動してください")
-                    
-                else:
-                    self.performance_monitor.finish_step("auto_optimization", False, result.get("message", "不明なエラー"))
-                    print(f"❌ 最適化失敗: {result.get('message', '不明なエラー')}")
-                    
-                    # エラー音声出力
-                    step = self.performance_monitor.start_step("optimization_error_audio_output")
-                    try:
-                        error_msg = "最適化に失敗しました。詳細はコンソールをご確認ください。"
-                        self.audio_output.speak_text(error_msg, blocking=True)
-                        self.performance_monitor.finish_step("optimization_error_audio_output", True)
-                    except Exception as e:
-                        self.performance_monitor.finish_step("optimization_error_audio_output", False, str(e))
-                
-            except Exception as e:
-                self.performance_monitor.finish_step("auto_optimization", False, str(e))
-                print(f"❌ 最適化実行エラー: {e}")
-            
-            self.performance_monitor.finish_session(True)
-            return
-
+        # 特殊コマンドの判定（終了・統計・最適化のキーワードを1回の走査で検索）
+        command_kinds = self._match_command_kinds(command)
+        
+        # 特殊コマンドは対応するハンドラで処理し、それ以外はGeminiに問い合わせる
+        for kind, handler in self._command_handlers:
+            if kind in command_kinds:
+                handler(command)
+                return
+        
+        self._ask_gemini(command)
+    
+    def _handle_exit_command(self, command: str):
+        """
+        終了コマンド：終了メッセージを読み上げてアシスタントを停止
+        
+        Args:
+            command: 認識されたコマンド
+        """
+        print("👋 音声アシスタントを終了します")
+        
+        # 終了メッセージ出力ステップ計測
+        step = self.performance_monitor.start_step("shutdown_message_output")
+        try:
+            shutdown_msg = self.system_messages["shutdown_message"]
+            self.audio_output.speak_cached(shutdown_msg, blocking=True)
+            self.performance_monitor.finish_step("shutdown_message_output", True)
+        except Exception as e:
+            self.performance_monitor.finish_step("shutdown_message_output", False, str(e))
+        
+        self.logger.log_shutdown()
+        self.performance_monitor.finish_session(True)
+        self.stop()
+    
+    def _handle_performance_command(self, command: str):
+        """
+        統計表示コマンド：パフォーマンス統計と最適化ガイドを表示
+        
+        Args:
+            command: 認識されたコマンド
+        """
+        print("📊 パフォーマンス統計を表示します")
+        self.performance_monitor.print_performance_report()
+        
+        # 最適化ガイドも表示
+        self.performance_monitor.print_optimization_guide()
+        
+        # 統計音声出力ステップ計測
+        step = self.performance_monitor.start_step("stats_audio_output")
+        try:
+            stats_msg = "パフォーマンス統計を表示しました。詳細はコンソールをご確認ください。"
+            self.audio_output.speak_text(stats_msg, blocking=True)
+            self.performance_monitor.finish_step("stats_audio_output", True)
+        except Exception as e:
+            self.performance_monitor.finish_step("stats_audio_output", False, str(e))
+        
+        self.performance_monitor.finish_session(True)
+    
+    def _handle_optimization_command(self, command: str):
+        """
+        最適化コマンド：計測結果に基づいて設定を自動調整
+        
+        Args:
+            command: 認識されたコマンド
+        """
+        print("⚙️ システム最適化を実行します")
+        
+        # 最適化ステップ計測
+        step = self.performance_monitor.start_step("auto_optimization")
+        try:
+            result = self.performance_monitor.apply_auto_optimization(self.config)
+        
+            if result["status"] == "success":
+                self.performance_monitor.finish_step("auto_optimization", True)
+                print(f"✅ 最適化完了 (優先度: {result['priority']})")
+                print("適用された変更:")
+                for change in result["changes"]:
+                    print(f"   ・{change}")
+        
+                # 最適化音声出力
+                step = self.performance_monitor.start_step("optimization_audio_output")
+                try:
+                    opt_msg = f"システム最適化を完了しました。{len(result['changes'])}項目の設定を更新しました。"
+                    self.audio_output.speak_text(opt_msg, blocking=True)
+                    self.performance_monitor.finish_step("optimization_audio_output", True)
+                except Exception as e:
+                    self.performance_monitor.finish_step("optimization_audio_output", False, str(e))
+        
+                print("\n🔄 設定を反映するにはアプリケーションを再起動してください")
+        
+            else:
+                self.performance_monitor.finish_step("auto_optimization", False, result.get("message", "不明なエラー"))
+                print(f"❌ 最適化失敗: {result.get('message', '不明なエラー')}")
+        
+                # エラー音声出力
+                step = self.performance_monitor.start_step("optimization_error_audio_output")
+                try:
+                    error_msg = "最適化に失敗しました。詳細はコンソールをご確認ください。"
+                    self.audio_output.speak_cached(error_msg, blocking=True)
+                    self.performance_monitor.finish_step("optimization_error_audio_output", True)
+                except Exception as e:
+                    self.performance_monitor.finish_step("optimization_error_audio_output", False, str(e))
+        
+        except Exception as e:
+            self.performance_monitor.finish_step("auto_optimization", False, str(e))
+            print(f"❌ 最適化実行エラー: {e}")
+        
+        self.performance_monitor.finish_session(True)
+    
+    def _ask_gemini(self, command: str):
+        """
+        コマンドをGeminiに送信し、応答をストリーミング再生
+        
+        Args:
+            command: 認識されたコマンド
+        """
         # Gemini通信ステップ計測
         step = self.performance_monitor.start_step("gemini_request")
         print("🤖 Geminiに問い合わせ中...")
         self.logger.log_gemini_request(command)
         
         try:
-            # 高速コマンド送信を使用
-            response = self.gemini_client.send_command_fast(command)
+            # 応答のストリーミング受信をバックグラウンドで開始（完成した文から順にキューへ）
+            sentence_queue = queue.Queue()
+            self.gemini_executor.submit(self._stream_gemini_sentences, command, sentence_queue)
+        
+            # 応答待ちの間に待機メッセージを再生（体感待ち時間の短縮）
+            self._speak_thinking_message()
+        
+            first_sentence = sentence_queue.get(timeout=self.gemini_result_timeout)
             self.performance_monitor.finish_step("gemini_request", True)
-            
-            if response:
-                self.logger.log_gemini_response(response, True)
-                print(f"\n💬 【Gemini応答】")
-                print(f"{response}")
-                print(f"{'='*50}")
-                
+        
+            if first_sentence is not None:
                 # 音声出力ステップ計測
                 step = self.performance_monitor.start_step("audio_output")
-                print("🔊 音声で応答を再生中...")
-                print(f"DEBUG: 応答テキスト長: {len(response)}")
-                print(f"DEBUG: 応答の最初の100文字: {response[:100]}")
-                
-                self.logger.log_audio_output(response)
-                
+                self.logger.debug("最初の文: %s", first_sentence)
+        
                 try:
                     # 音声出力中は音声検知を停止
                     self.continuous_monitor.set_audio_output_active(True)
-                    
+        
                     # 音声出力前の追加チェック
-                    if self.audio_output and self.audio_output.engine:
-                        print("DEBUG: 音声エンジン確認OK")
-                        audio_success = self.audio_output.speak_text(response, blocking=False)  # 非同期に変更
-                        print(f"DEBUG: 音声出力結果: {audio_success}")
+                    if self.audio_output and self.audio_output.is_available():
+                        # 受信済みの文から読み上げ開始（残りは届いた順に再生）
+                        sentences = itertools.chain([first_sentence], iter(sentence_queue.get, None))
+                        audio_success = self.audio_output.speak_stream(sentences, blocking=False)
                         if audio_success:
-                            print("✅ 音声再生開始")
                             self.performance_monitor.finish_step("audio_output", True)
                         else:
-                            print("❌ 音声再生失敗")
+                            self.logger.log_error("音声再生失敗")
                             self.performance_monitor.finish_step("audio_output", False, "音声再生失敗")
                     else:
-                        print("❌ 音声エンジンが利用できません")
-                        print("DEBUG: audio_output存在:", self.audio_output is not None)
-                        if self.audio_output:
-                            print("DEBUG: engine存在:", self.audio_output.engine is not None)
+                        self.logger.log_error("音声エンジンが利用できません")
+                        self.logger.debug("audio_output存在: %s", self.audio_output is not None)
                         self.performance_monitor.finish_step("audio_output", False, "音声エンジン利用不可")
                 except Exception as e:
                     self.performance_monitor.finish_step("audio_output", False, str(e))
                     raise
                 finally:
-                    # 音声出力完了後は音声検知を再開（短い待機時間）
-                    time.sleep(0.2)  # 200msに短縮
+                    # 音声検知を再開（再生が先に終われば即座に、最長200ms待機）
+                    self.audio_output.wait_until_idle(timeout=0.2)
                     self.continuous_monitor.set_audio_output_active(False)
-                
+        
                 # セッション成功完了
                 self.performance_monitor.finish_session(True)
-                
+        
             else:
-                error_msg = "Geminiからの応答を取得できませんでした"
+                error_msg = self.system_messages["no_response_message"]
                 self.logger.log_gemini_response("", False)
                 print(f"❌ {error_msg}")
-                
+        
                 # エラー音声出力
                 step = self.performance_monitor.start_step("error_audio_output")
                 try:
                     self.continuous_monitor.set_audio_output_active(True)
-                    self.audio_output.speak_text(error_msg, blocking=True)
+                    self.audio_output.speak_cached(error_msg, blocking=True)
                     self.performance_monitor.finish_step("error_audio_output", True)
                 except Exception as e:
                     self.performance_monitor.finish_step("error_audio_output", False, str(e))
                 finally:
-                    time.sleep(0.5)
+                    # 同期再生のため通常は待たずに音声検知を再開（残響は抑制時間で除外）
+                    self.audio_output.wait_until_idle(timeout=0.5)
                     self.continuous_monitor.set_audio_output_active(False)
-                
+        
                 self.performance_monitor.finish_session(False)
-                
+        
         except Exception as e:
             error_msg = f"Gemini通信エラーが発生しました: {str(e)}"
             self.performance_monitor.finish_step("gemini_request", False, str(e))
             self.logger.log_error("Gemini通信エラー", e)
             print(f"❌ {error_msg}")
             print("接続状況を確認してください")
-            
+        
             # エラー音声出力
             step = self.performance_monitor.start_step("error_audio_output")
             try:
                 self.continuous_monitor.set_audio_output_active(True)
-                self.audio_output.speak_text("通信エラーが発生しました", blocking=True)
+                self.audio_output.speak_cached(self.system_messages["connection_error_message"], blocking=True)
                 self.performance_monitor.finish_step("error_audio_output", True)
             except Exception as e2:
                 self.performance_monitor.finish_step("error_audio_output", False, str(e2))
             finally:
-                time.sleep(0.5)
+                # 同期再生のため通常は待たずに音声検知を再開（残響は抑制時間で除外）
+                self.audio_output.wait_until_idle(timeout=0.5)
                 self.continuous_monitor.set_audio_output_active(False)
-            
+        
             self.performance_monitor.finish_session(False)
     
+    def _stream_gemini_sentences(self, command: str, sentence_queue: "queue.Queue"):
+        """
+        Gemini応答をストリーミング受信し、完成した文から順にキューへ投入（終端はNone）
+        
+        Args:
+            command: 送信するコマンド
+            sentence_queue: 読み上げる文の投入先
+        """
+        chunks = []
+        
+        def received_chunks():
+            for chunk in self.gemini_client.stream_command(command):
+                chunks.append(chunk)
+                yield chunk
+        
+        source = received_chunks()
+        try:
+            for sentence in self.audio_output.stream_sentences(source):
+                sentence_queue.put(sentence)
+        except Exception as e:
+            self.logger.log_error("Geminiストリーミング受信エラー", e)
+        finally:
+            sentence_queue.put(None)
+        
+        # 読み上げは上限で打ち切っても、表示・記録用に応答は最後まで受信する
+        try:
+            for _ in source:
+                pass
+        except Exception as e:
+            self.logger.log_error("Geminiストリーミング受信エラー", e)
+        
+        response = "".join(chunks).strip()
+        if response:
+            self.logger.log_gemini_response(response, True)
+            self.logger.log_audio_output(response)
+            print(f"\n💬 【Gemini応答】")
+            print(f"{response}")
+            print(f"{'='*50}")
+    
+    def _speak_thinking_message(self):
+        """Gemini応答待ちの間に待機メッセージ（キャッシュ済み音声）を再生"""
+        thinking_msg = self.thinking_message
+        if not thinking_msg:
+            return
+        
+        try:
+            self.continuous_monitor.set_audio_output_active(True)
+            self.audio_output.speak_cached(thinking_msg, blocking=True)
+        except Exception as e:
+            print(f"⚠️ 待機メッセージ再生エラー: {e}")
+        finally:
+            self.continuous_monitor.set_audio_output_active(False)
+    
     def run(self):
         """メインループ実行"""
         print("\n🎤 音声アシスタントが開始されました")
         print("Ctrl+C で終了できます")
         
+        # Ctrl+Cは終了イベントで処理（sys.exitとKeyboardInterruptの二重処理を避ける）
+        signal.signal(signal.SIGINT, self._handle_shutdown_signal)
+        
         try:
             # 常時音声監視開始（起動案内前に開始）
+            self.command_worker.start()
             self.continuous_monitor.start_monitoring()
-            print("📡 常時ウェイクワード監視開始")
-            print(f"ウェイクワード: {', '.join(self.wake_words)}")
-            print("いつでもウェイクワードを話しかけてください...")
+            sys.stdout.write(self._wake_print)
             
             # 音声出力状態を通知（起動案内中は音声検知を抑制）
             self.continuous_monitor.set_audio_output_active(True)
             
+            # 起動案内の再生中にGemini CLIを事前起動（初回問い合わせの待ちを隠す）
+            threading.Thread(target=self.gemini_client.warmup, daemon=True).start()
+            
             # 起動音声案内（音声検知開始後に実行）
-            startup_msg = self.system_messages.get("startup_message", "音声アシスタント ルクス が起動しました。ルクス と呼びかけてください。")
-            self.audio_output.speak_text(startup_msg, blocking=True)
+            # ウォームアップ完了を待ってから起動メッセージを再生（エンジンの同時使用を防ぐ）
+            self.warmup_thread.join(timeout=5.0)
+            
+            startup_msg = self.system_messages["startup_message"]
+            self.audio_output.speak_cached(startup_msg, blocking=True)
             
             # 音声出力完了後、音声検知を再開
             self.continuous_monitor.set_audio_output_active(False)
             
-            # メインループ - 常時監視状態を維持
-            while self.is_running:
-                time.sleep(0.5)  # CPU使用率を下げるため
+            # メインループ - 終了要求まで待機（ポーリングせずイベントで起床）
+            # Windowsでは無期限のwait()中にCtrl+Cが届かないため、区切って待機する
+            while not self._stop_event.wait(timeout=1.0):
+                pass
                 
         except KeyboardInterrupt:
             print("\n\n👋 音声アシスタントを終了します")
@@ -489,21 +737,49 @@ class VoiceAssistant:
         finally:
             self.cleanup()
     
+    @property
+    def is_running(self) -> bool:
+        """実行中かどうか（終了イベントが立つまでTrue）"""
+        return not self._stop_event.is_set()
+    
+    def stop(self):
+        """メインループ・コマンド処理ワーカーに終了を要求"""
+        self._stop_event.set()
+        if self.command_queue is not None:
+            self.command_queue.put(None)  # ワーカーを起こす終了マーカー
+    
+    def _handle_shutdown_signal(self, signum, frame):
+        """シグナルハンドラー（Ctrl+C対応）：例外を投げずに終了イベントを立てる"""
+        print("\n\n終了シグナルを受信しました...")
+        self.stop()
+    
     def cleanup(self):
         """リソースの清理と統計情報表示"""
         try:
             print("\n📊 === パフォーマンス統計 ===")
             
             # パフォーマンスレポート出力
-            if hasattr(self, 'performance_monitor'):
+            if self.performance_monitor is not None:
                 self.performance_monitor.print_performance_report()
             
+            # メインループ・コマンド処理ワーカー停止
+            self.stop()
+            
+            if self.gemini_executor is not None:
+                self.gemini_executor.shutdown(wait=False)
+            
+            if self.gemini_client is not None:
+                self.gemini_client.close()
+            
+            if self._cmd_executor is not None:
+                self._cmd_executor.shutdown(wait=False, cancel_futures=True)
+            
             # 常時監視システム停止
-            if hasattr(self, 'continuous_monitor'):
+            if self.continuous_monitor is not None:
                 self.continuous_monitor.cleanup()
             
             # 音声出力統計
-            if hasattr(self.audio_output, 'get_stats'):
+            if self.audio_output is not None:
                 audio_stats = self.audio_output.get_stats()
                 print(f"🔊 音声出力統計:")
                 print(f"   総出力回数: {audio_stats.get('total_outputs', 0)}")
@@ -525,44 +801,36 @@ class VoiceAssistant:
                 print(f"   プロファイル切替回数: {optimizer_stats.get('profile_switches', 0)}")
                 print(f"   現在のプロファイル: {optimizer_stats.get('current_profile', 'なし')}")
             
-            # システム終了処理
-            if hasattr(self, 'performance_monitor') and self.performance_monitor:
-                # パフォーマンス監視にはstop_monitoringメソッドはないのでコメントアウト
-                pass
-            
             if self.parallel_speech:
                 self.parallel_speech.shutdown()
             
             if self.audio_optimizer:
                 self.audio_optimizer.cleanup()
             
-            if hasattr(self.audio_output, 'cleanup'):
+            if self.audio_output is not None:
                 self.audio_output.cleanup()
             
+            if self.audio_handler is not None:
+                self.audio_handler.close()
+            
             # 終了メッセージ
-            shutdown_msg = self.system_messages.get("shutdown_message", "音声アシスタントを終了します。お疲れ様でした。")
-            print(f"\n{shutdown_msg}")
+            shutdown_msg = self.system_messages.get("shutdown_message")
+            if shutdown_msg:
+                print(f"\n{shutdown_msg}")
             
         except Exception as e:
             print(f"⚠️ クリーンアップエラー: {e}")
 
 
-def signal_handler(signum, frame):
-    """シグナルハンドラー（Ctrl+C対応）"""
-    print("\n\n終了シグナルを受信しました...")
-    sys.exit(0)
-
-
 def main():
     """メイン関数"""
-    # シグナルハンドラー設定
-    signal.signal(signal.SIGINT, signal_handler)
-    
     try:
-        # 音声アシスタント起動
+        # 音声アシスタント起動（Ctrl+Cはrun()内で終了イベントとして処理）
         assistant = VoiceAssistant()
         assistant.run()
         
+    except KeyboardInterrupt:
+        print("\n\n👋 起動を中断しました")
     except Exception as e:
         print(f"起動エラー: {e}")
         sys.exit(1)
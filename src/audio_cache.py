@@ -8,9 +8,74 @@ import io
 import wave
 import threading
 import logging
-from typing import Dict, Optional, List
+import unicodedata
+import mmap
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Optional, List, Tuple, Union
 import os
 
+# Windows Speech API（オプション、利用可能ならフレーズを並列合成）
+try:
+    import pythoncom
+    import win32com.client
+    SAPI_AVAILABLE = True
+except ImportError:
+    SAPI_AVAILABLE = False
+
+# SpFileStream.Open のモード（書き込み用に新規作成）
+SSFM_CREATE_FOR_WRITE = 3
+
+
+
+def parse_wav_header(data) -> Optional[Tuple[int, int, int, int, int]]:
+    """
+    RIFF/WAVのヘッダーを解析（wave.openを使わずにPCM部分の位置を取得する）
+    
+    Args:
+        data: WAVデータ（bytes・mmapなどのバッファ）
+        
+    Returns:
+        (チャンネル数, サンプル幅, サンプリングレート, PCM開始位置, PCMバイト数)。解析できない場合はNone
+    """
+    view = memoryview(data)
+    if len(view) < 12 or view[0:4] != b'RIFF' or view[8:12] != b'WAVE':
+        return None
+    
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        size = struct.unpack_from('<I', view, offset + 4)[0]
+        body = offset + 8
+        if chunk_id == b'fmt ' and size >= 16:
+            _, channels, framerate, _, _, bits = struct.unpack_from('<HHIIHH', view, body)
+            fmt = (channels, bits // 8, framerate)
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            return fmt + (body, min(size, len(view) - body))
+        offset = body + size + (size & 1)  # チャンクは2バイト境界に揃えられる
+    
+    return None
+
+
+def normalize_phrase(text: str) -> str:
+    """
+    キャッシュ照合用にテキストを正規化（NFKC・大文字小文字統一・空白の集約）
+    
+    Args:
+        text: 元のテキスト
+        
+    Returns:
+        正規化したテキスト
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+# キャッシュ音声データ（ディスク上のWAVはmmapで保持し、読み込み時のコピーを避ける）
+AudioData = Union[bytes, mmap.mmap]
+
 
 class AudioCache:
     """音声合成結果をキャッシュするクラス"""
@@ -25,12 +90,18 @@ class AudioCache:
         """
         self.cache_phrases = cache_phrases
         self.voice_settings = voice_settings
-        self.audio_cache: Dict[str, bytes] = {}
+        self.audio_cache: Dict[str, AudioData] = {}
         self.logger = logging.getLogger(__name__)
         
-        # TTSエンジン初期化
-        self.tts_engine = pyttsx3.init()
-        self._configure_tts_engine()
+        # 照合用インデックス（正規化テキスト → 音声）
+        self._norm_cache: Dict[str, AudioData] = {}
+        self._index_lock = threading.Lock()
+        
+        # 事前生成の完了（結果はキャッシュ済みフレーズ数）
+        self.ready: "Future[int]" = Future()
+        
+        # TTSエンジン（SAPIで生成できなかったフレーズがある場合のみ、生成スレッドで初期化）
+        self.tts_engine = None
         
         # キャッシュディレクトリ作成
         self.cache_dir = "cache/audio"
@@ -55,31 +126,132 @@ class AudioCache:
         except Exception as e:
             self.logger.warning(f"TTS設定エラー: {e}")
     
+    def _synthesize_with_sapi(self, phrase: str, cache_file: str):
+        """
+        SAPIでフレーズをWAVファイルに合成（ワーカースレッドごとに専用のSpVoiceを使用）
+        
+        Args:
+            phrase: 合成するテキスト
+            cache_file: 出力先WAVファイル
+        """
+        pythoncom.CoInitialize()
+        try:
+            voice = win32com.client.Dispatch("SAPI.SpVoice")
+            voice.Rate = min(10, max(-10, (self.voice_settings.get('rate', 200) - 200) // 20))
+            voice.Volume = int(self.voice_settings.get('volume', 0.8) * 100)
+            
+            voice_id = self.voice_settings.get('voice_id')
+            if isinstance(voice_id, int):
+                voices = voice.GetVoices()
+                if voice_id < voices.Count:
+                    voice.Voice = voices.Item(voice_id)
+            
+            stream = win32com.client.Dispatch("SAPI.SpFileStream")
+            stream.Open(cache_file, SSFM_CREATE_FOR_WRITE)
+            try:
+                voice.AudioOutputStream = stream
+                voice.Speak(phrase, 0)
+            finally:
+                stream.Close()
+        finally:
+            pythoncom.CoUninitialize()
+    
+    def _synthesize_with_engine(self, phrase: str, cache_file: str):
+        """
+        pyttsx3でフレーズをWAVファイルに合成（1フレーズずつ直列）
+        
+        Args:
+            phrase: 合成するテキスト
+            cache_file: 出力先WAVファイル
+        """
+        if self.tts_engine is None:
+            self.tts_engine = pyttsx3.init()
+            self._configure_tts_engine()
+        self.tts_engine.save_to_file(phrase, cache_file)
+        self.tts_engine.runAndWait()
+    
+    def _load_cache_file(self, phrase: str, cache_file: str):
+        """
+        合成済みWAVファイルをメモリマップしてキャッシュに登録
+        
+        データはOSのページキャッシュが保持するため、プロセス内にバイト列のコピーを持たない
+        
+        Args:
+            phrase: フレーズ
+            cache_file: WAVファイルのパス
+        """
+        with open(cache_file, 'rb') as f:
+            try:
+                audio_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # 空ファイルはマップできない
+                audio_data = f.read()
+        self._store(phrase, audio_data)
+    
     def pregenerate_cache(self):
         """
         キャッシュフレーズを事前生成
+        
+        SAPIが利用可能な場合は未生成のフレーズを複数スレッドで並列に合成する
+        （pyttsx3のrunAndWaitは1エンジンにつき直列にしか動かないため）
+        
+        Returns:
+            生成スレッド（完了はreadyで待機・確認できる）
         """
         def generate_thread():
+            try:
+                generate()
+            except Exception as e:
+                self.logger.error(f"音声キャッシュ生成エラー: {e}")
+            finally:
+                if not self.ready.done():
+                    self.ready.set_result(len(self.audio_cache))
+        
+        def generate():
+            pending = []
             for i, phrase in enumerate(self.cache_phrases):
+                # 音声ファイルパス
+                cache_file = os.path.join(self.cache_dir, f"cache_{i}.wav")
+                
+                # 既存のキャッシュファイルがあれば読み込み
+                if os.path.exists(cache_file):
+                    try:
+                        self._load_cache_file(phrase, cache_file)
+                        print(f"✅ キャッシュ読み込み: {phrase}")
+                        continue
+                    except Exception as e:
+                        self.logger.error(f"キャッシュ読み込みエラー ({phrase}): {e}")
+                pending.append((phrase, cache_file))
+            
+            # SAPIで並列生成（失敗したフレーズはpyttsx3で再試行）
+            if SAPI_AVAILABLE and pending:
+                failed = []
+                workers = min(len(pending), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-cache") as executor:
+                    futures = {
+                        executor.submit(self._synthesize_with_sapi, phrase, cache_file): (phrase, cache_file)
+                        for phrase, cache_file in pending
+                    }
+                    for future in as_completed(futures):
+                        phrase, cache_file = futures[future]
+                        try:
+                            future.result()
+                            self._load_cache_file(phrase, cache_file)
+                            print(f"🎵 音声生成完了: {phrase}")
+                        except Exception as e:
+                            self.logger.warning(f"SAPI音声生成エラー ({phrase}): {e}")
+                            failed.append((phrase, cache_file))
+                pending = failed
+            
+            for phrase, cache_file in pending:
                 try:
-                    # 音声ファイルパス
-                    cache_file = os.path.join(self.cache_dir, f"cache_{i}.wav")
+                    # 新規生成
+                    self._synthesize_with_engine(phrase, cache_file)
+                    
+                    # 生成されたファイルを読み込み
+                    self._load_cache_file(phrase, cache_file)
+                    print(f"🎵 音声生成完了: {phrase}")
                     
-                    # 既存のキャッシュファイルがあれば読み込み
-                    if os.path.exists(cache_file):
-                        with open(cache_file, 'rb') as f:
-                            self.audio_cache[phrase] = f.read()
-                        print(f"✅ キャッシュ読み込み: {phrase}")
-                    else:
-                        # 新規生成
-                        self.tts_engine.save_to_file(phrase, cache_file)
-                        self.tts_engine.runAndWait()
-                        
-                        # 生成されたファイルを読み込み
-                        with open(cache_file, 'rb') as f:
-                            self.audio_cache[phrase] = f.read()
-                        print(f"🎵 音声生成完了: {phrase}")
-                        
                 except Exception as e:
                     self.logger.error(f"音声生成エラー ({phrase}): {e}")
             
@@ -90,26 +262,40 @@ class AudioCache:
         thread.start()
         return thread
     
-    def get_cached_audio(self, text: str) -> Optional[bytes]:
+    def get_cached_audio(self, text: str) -> Optional[AudioData]:
         """
-        キャッシュされた音声データを取得
+        キャッシュされた音声データを取得（完全一致・正規化後の一致のみ）
+        
+        フレーズの一部やフレーズを含む文には別の音声を返さない（読み上げ内容が変わるため）
         
         Args:
             text: テキスト
             
         Returns:
-            音声データ（バイト）またはNone
+            音声データ（bytesまたは読み取り専用mmap。いずれもバッファとして扱える）またはNone
         """
         # 完全一致
-        if text in self.audio_cache:
-            return self.audio_cache[text]
+        audio_data = self.audio_cache.get(text)
+        if audio_data is not None:
+            return audio_data
         
-        # 部分一致検索
-        for cached_phrase in self.audio_cache:
-            if cached_phrase in text or text in cached_phrase:
-                return self.audio_cache[cached_phrase]
+        # 正規化後の完全一致
+        normalized = normalize_phrase(text)
+        if not normalized:
+            return None
+        return self._norm_cache.get(normalized)
+    
+    def _store(self, text: str, audio_data: AudioData):
+        """
+        音声をキャッシュと照合用インデックスに登録
         
-        return None
+        Args:
+            text: テキスト
+            audio_data: 音声データ
+        """
+        self.audio_cache[text] = audio_data
+        with self._index_lock:
+            self._norm_cache[normalize_phrase(text)] = audio_data
     
     def add_to_cache(self, text: str, audio_data: bytes):
         """
@@ -119,16 +305,30 @@ class AudioCache:
             text: テキスト
             audio_data: 音声データ
         """
-        self.audio_cache[text] = audio_data
+        self._store(text, audio_data)
         print(f"📝 キャッシュ追加: {text}")
     
     def clear_cache(self):
         """キャッシュをクリア"""
+        # マップ中のファイルは削除できない（Windows）ため先に閉じる
+        for audio_data in self.audio_cache.values():
+            if isinstance(audio_data, mmap.mmap):
+                try:
+                    audio_data.close()
+                except BufferError:
+                    # 再生中のビュー（np.frombufferなど）が残っている場合は閉じられない。参照がなくなった時点で解放される
+                    self.logger.debug("Cached audio is still in use; leaving the mapping open")
         self.audio_cache.clear()
+        with self._index_lock:
+            self._norm_cache.clear()
         # キャッシュファイルも削除
         for file in os.listdir(self.cache_dir):
             if file.startswith("cache_") and file.endswith(".wav"):
-                os.remove(os.path.join(self.cache_dir, file))
+                try:
+                    os.remove(os.path.join(self.cache_dir, file))
+                except OSError as e:
+                    # マップを閉じられなかったファイル（Windows）は次回起動時に上書きされる
+                    self.logger.debug(f"Cache file not removed: {file}: {e}")
         print("🗑️ 音声キャッシュをクリアしました")
     
     def get_cache_stats(self) -> Dict:
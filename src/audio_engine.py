@@ -0,0 +1,89 @@
+"""
+音声合成エンジン共有モジュール
+pyttsx3エンジンと音声一覧をプロセス内で1度だけ初期化して使い回す
+"""
+
+import threading
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> "pyttsx3.Engine":
+    """
+    共有pyttsx3エンジンを取得（初回呼び出し時のみ初期化）
+
+    pyttsx3.init()はSAPI5ドライバと音声データの読み込みを伴い重いため、
+    音声出力・診断スクリプトなどで同じエンジンを共有する
+
+    Returns:
+        pyttsx3エンジン
+    """
+    global _engine
+
+    if _engine is not None:
+        return _engine
+
+    with _engine_lock:
+        if _engine is None:
+            # pyttsx3はcomtypes・音声レジストリを読み込むため、初回使用時にインポート
+            import pyttsx3
+            _engine = pyttsx3.init()
+        return _engine
+
+
+_voices = None
+_voices_by_lang = None
+
+
+def _lang_code(lang) -> str:
+    """
+    言語表記を正規化（例: 'ja_JP' / b'\\x05ja_JP' / 'ja-JP' → 'ja'）
+
+    Args:
+        lang: pyttsx3が返す言語表記（文字列またはバイト列）
+
+    Returns:
+        小文字の言語コード
+    """
+    if isinstance(lang, bytes):
+        lang = lang.decode('utf-8', errors='ignore')
+    lang = ''.join(ch for ch in str(lang) if ch.isprintable()).strip().lower()
+    return lang.replace('-', '_').split('_')[0]
+
+
+def get_voices() -> list:
+    """
+    利用可能な音声一覧を取得（初回のみ列挙してキャッシュ）
+
+    SAPI5では音声の列挙ごとにレジストリを走査するため、結果を使い回す
+
+    Returns:
+        pyttsx3のVoiceオブジェクトのリスト
+    """
+    global _voices
+
+    if _voices is None:
+        _voices = list(get_engine().getProperty('voices') or [])
+
+    return _voices
+
+
+def get_voices_by_lang() -> dict:
+    """
+    言語コード → 音声の辞書を取得（各言語で最初に見つかった音声）
+
+    Returns:
+        {'ja': Voice, 'en': Voice, ...}
+    """
+    global _voices_by_lang
+
+    if _voices_by_lang is None:
+        voices_by_lang = {}
+        for voice in get_voices():
+            for lang in (voice.languages or []):
+                voices_by_lang.setdefault(_lang_code(lang), voice)
+        _voices_by_lang = voices_by_lang
+
+    return _voices_by_lang
@@ -6,10 +6,16 @@
 import sounddevice as sd
 import soundfile as sf
 import numpy as np
+import webrtcvad
 import queue
-import threading
 import time
-from typing import Optional, Callable
+from contextlib import contextmanager
+from typing import Iterator, Optional, Callable
+
+try:
+    from .dsp_kernels import frame_energy, has_silent_run, pcm16_with_rms
+except ImportError:
+    from dsp_kernels import frame_energy, has_silent_run, pcm16_with_rms
 
 
 class AudioInputHandler:
@@ -34,10 +40,21 @@ class AudioInputHandler:
         self.chunk_size = chunk_size
         self.recording_duration = recording_duration
         
-        # 録音データ保存用
+        # 音声レベル表示（start_monitoring）用
         self.audio_queue = queue.Queue()
         self.is_recording = False
-        self.recorded_data = []
+        
+        # 録音用の事前確保バッファ（録音ごとの確保・結合を避けて使い回す）
+        self._pcm_buf = np.zeros((sample_rate * (recording_duration + 1), channels), dtype=np.float32)
+        self._pcm_written = 0
+        
+        # 録音終了判定用のWebRTC VAD（30msフレーム単位、対応外のサンプリングレートではRMSのみで判定）
+        self.vad = webrtcvad.Vad(2)
+        self._vad_frame = sample_rate * 30 // 1000 if sample_rate in (8000, 16000, 32000, 48000) else 0
+        self._pcm16 = np.zeros(chunk_size, dtype=np.int16)  # VAD入力用の変換バッファ（ブロックごとに使い回す）
+        
+        # 録音用入力ストリーム（初回の録音時に開き、以降は開始・停止のみで使い回す）
+        self._stream: Optional["sd.InputStream"] = None
         
         print(f"音声入力初期化完了: {sample_rate}Hz, {channels}ch")
         
@@ -59,6 +76,110 @@ class AudioInputHandler:
             # 音声データをキューに追加
             self.audio_queue.put(indata.copy())
     
+    def _start_pooled_recording(self, max_duration: float):
+        """
+        事前確保バッファへの録音を開始
+        
+        Args:
+            max_duration: 最大録音時間（秒）。バッファが足りない場合のみ再確保する
+        """
+        required = int(self.sample_rate * (max_duration + 1))
+        if len(self._pcm_buf) < required:
+            self._pcm_buf = np.zeros((required, self.channels), dtype=np.float32)
+        
+        self._pcm_written = 0
+        self.is_recording = True
+    
+    def _finish_pooled_recording(self) -> np.ndarray:
+        """
+        事前確保バッファへの録音を終了
+        
+        Returns:
+            録音済み部分のコピー（バッファは次の録音で上書きされるため、呼び出し側が保持できるよう複製する）
+        """
+        self.is_recording = False
+        return self._pcm_buf[:self._pcm_written].copy()
+    
+    @contextmanager
+    def _recording_stream(self) -> Iterator["sd.InputStream"]:
+        """
+        録音用入力ストリームを開始し、終了時に停止する（デバイスのオープンは初回のみ）
+        
+        停止中のストリームは音声を取り込まないため、前回の録音以降の古い音声は読み出されない
+        
+        Yields:
+            開始済みの入力ストリーム（コールバックなし、float32）
+        """
+        if self._stream is None:
+            self._stream = sd.InputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                blocksize=self.chunk_size,
+                dtype='float32'
+            )
+        
+        try:
+            self._stream.start()
+        except Exception:
+            # デバイスの切断などで開始できない場合は、次回の録音で開き直す
+            self.close()
+            raise
+        
+        try:
+            yield self._stream
+        finally:
+            self._stream.stop()
+    
+    def close(self):
+        """録音用入力ストリームを閉じる"""
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception as e:
+                print(f"入力ストリーム終了エラー: {e}")
+            self._stream = None
+    
+    def _read_block(self, stream: "sd.InputStream") -> Optional[np.ndarray]:
+        """
+        ブロッキング読み出しで1ブロック録音し、事前確保バッファに書き込む
+        
+        Args:
+            stream: コールバックなしで開いた入力ストリーム
+            
+        Returns:
+            書き込んだ範囲のビュー（バッファが満杯の場合はNone）
+        """
+        data, overflowed = stream.read(self.chunk_size)
+        if overflowed:
+            print("音声入力エラー: input overflow")
+        
+        start = self._pcm_written
+        end = min(start + len(data), len(self._pcm_buf))
+        if end <= start:
+            return None
+        self._pcm_buf[start:end] = data[:end - start]
+        self._pcm_written = end
+        return self._pcm_buf[start:end]
+    
+    def _is_speech(self, pcm: np.ndarray) -> bool:
+        """
+        ブロック内に発話フレームが含まれるかをWebRTC VADで判定
+        
+        Args:
+            pcm: 録音ブロックの1チャンネル目（int16）
+            
+        Returns:
+            発話を含む場合True（VADが使えない場合は常にTrue）
+        """
+        frame = self._vad_frame
+        if not frame or len(pcm) < frame:
+            return True
+        
+        for start in range(0, len(pcm) - frame + 1, frame):
+            if self.vad.is_speech(pcm[start:start + frame].tobytes(), self.sample_rate):
+                return True
+        return False
+    
     def start_monitoring(self, volume_threshold: float = 0.01):
         """音声レベルの監視を開始"""
         print("音声監視を開始しています...")
@@ -69,14 +190,15 @@ class AudioInputHandler:
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 callback=self.audio_callback,
-                blocksize=self.chunk_size
+                blocksize=self.chunk_size,
+                dtype='float32'
             ):
                 while True:
                     time.sleep(0.1)
                     # 簡単な音声レベル表示
                     if not self.audio_queue.empty():
-                        data = self.audio_queue.get()
-                        volume = np.sqrt(np.mean(data**2))
+                        data = self.audio_queue.get().reshape(-1)
+                        volume = frame_energy(data, len(data), len(data))[0]
                         if volume > volume_threshold:
                             print(f"音声検知: {volume:.4f}")
                             
@@ -102,23 +224,21 @@ class AudioInputHandler:
         """
         print("🎤 音声検出を開始...")
         
-        # 録音データクリア
-        self.recorded_data = []
-        self.is_recording = True
+        # 事前確保バッファへの録音開始
+        self._start_pooled_recording(max_duration)
         
         start_time = time.time()
         last_voice_time = start_time
         voice_detected = False
         silence_start_time = None
         
-        # 音声ストリーム開始
-        with sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=self.channels,
-            callback=self.audio_callback,
-            blocksize=self.chunk_size
-        ):
+        # 音声ストリーム開始（コールバックを使わずブロッキング読み出しで録音）
+        with self._recording_stream() as stream:
             while self.is_recording:
+                # 1ブロック分のデータが揃うまで待機
+                data = self._read_block(stream)
+                if data is None:
+                    break
                 current_time = time.time()
                 
                 # 最大録音時間チェック
@@ -126,48 +246,39 @@ class AudioInputHandler:
                     print(f"⏰ 最大録音時間({max_duration}秒)に到達")
                     break
                 
-                try:
-                    # キューからデータを取得（短いタイムアウト）
-                    data = self.audio_queue.get(timeout=0.05)
-                    self.recorded_data.append(data)
-                    
-                    # 音声レベル計算
-                    volume = np.sqrt(np.mean(data**2))
+                # 音声レベル計算とVAD用のint16変換（1チャンネル目を1回の走査で処理）
+                pcm = self._pcm16[:len(data)]
+                volume = pcm16_with_rms(data[:, 0], pcm)
+                
+                # 音声検出（音量が閾値を超え、かつVADが発話と判定したブロックのみ）
+                if volume > silence_threshold and self._is_speech(pcm):
+                    if not voice_detected:
+                        print("🔊 音声検出")
+                        voice_detected = True
+                    last_voice_time = current_time
+                    silence_start_time = None
+                else:
+                    # 無音検出
+                    if voice_detected and silence_start_time is None:
+                        silence_start_time = current_time
                     
-                    # 音声検出
-                    if volume > silence_threshold:
-                        if not voice_detected:
-                            print("🔊 音声検出")
-                            voice_detected = True
-                        last_voice_time = current_time
-                        silence_start_time = None
-                    else:
-                        # 無音検出
-                        if voice_detected and silence_start_time is None:
-                            silence_start_time = current_time
-                        
-                        # 発話終了判定
-                        if (voice_detected and 
-                            silence_start_time and 
-                            current_time - silence_start_time > post_silence_duration and
-                            current_time - start_time > min_duration):
-                            print("🔇 発話終了を検出")
-                            break
-                            
-                except queue.Empty:
-                    continue
+                    # 発話終了判定
+                    if (voice_detected and 
+                        silence_start_time and 
+                        current_time - silence_start_time > post_silence_duration and
+                        current_time - start_time > min_duration):
+                        print("🔇 発話終了を検出")
+                        break
         
-        self.is_recording = False
+        audio_data = self._finish_pooled_recording()
         
-        # 録音データを結合
-        if self.recorded_data:
-            audio_data = np.concatenate(self.recorded_data, axis=0)
+        if len(audio_data) > 0:
             duration = len(audio_data) / self.sample_rate
             print(f"✅ 録音完了: {duration:.2f}秒")
             return audio_data
         else:
             print("⚠️ 録音データがありません")
-            return np.array([])
+            return np.array([], dtype=np.float32)
     
     def record_audio(self, duration: Optional[int] = None) -> np.ndarray:
         """
@@ -186,45 +297,27 @@ class AudioInputHandler:
         # 従来の固定時間録音
         print(f"録音開始: {duration}秒間録音します...")
         
-        # 録音データクリア
-        self.recorded_data = []
-        self.is_recording = True
+        # 事前確保バッファへの録音開始
+        self._start_pooled_recording(duration)
         
-        # 録音タイマー
-        def stop_recording():
-            time.sleep(duration)
-            self.is_recording = False
-            print("録音終了")
-        
-        timer_thread = threading.Thread(target=stop_recording)
-        timer_thread.start()
-        
-        # 音声ストリーム開始
-        with sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=self.channels,
-            callback=self.audio_callback,
-            blocksize=self.chunk_size
-        ):
-            # 録音中の処理
-            while self.is_recording:
-                try:
-                    # キューからデータを取得
-                    data = self.audio_queue.get(timeout=0.1)
-                    self.recorded_data.append(data)
-                except queue.Empty:
-                    continue
+        # 音声ストリーム開始（指定時間分のサンプルをブロッキング読み出し）
+        target_frames = int(self.sample_rate * duration)
+        with self._recording_stream() as stream:
+            while self.is_recording and self._pcm_written < target_frames:
+                if self._read_block(stream) is None:
+                    break
         
-        timer_thread.join()
+        self._pcm_written = min(self._pcm_written, target_frames)
+        print("録音終了")
         
-        # 録音データを結合
-        if self.recorded_data:
-            audio_data = np.concatenate(self.recorded_data, axis=0)
+        audio_data = self._finish_pooled_recording()
+        
+        if len(audio_data) > 0:
             print(f"録音完了: {len(audio_data)/self.sample_rate:.2f}秒")
             return audio_data
         else:
             print("録音データがありません")
-            return np.array([])
+            return np.array([], dtype=np.float32)
     
     def save_audio(self, audio_data: np.ndarray, filename: str):
         """音声データをファイルに保存"""
@@ -248,24 +341,16 @@ class AudioInputHandler:
         Returns:
             無音が検知されたかどうか
         """
-        # 音声レベルの計算
+        if len(audio_data) == 0:
+            return False
+        
         frame_length = int(self.sample_rate * 0.1)  # 0.1秒フレーム
         silence_frames = int(silence_duration / 0.1)
         
-        consecutive_silence = 0
-        
-        for i in range(0, len(audio_data), frame_length):
-            frame = audio_data[i:i+frame_length]
-            if len(frame) > 0:
-                volume = np.sqrt(np.mean(frame**2))
-                if volume < silence_threshold:
-                    consecutive_silence += 1
-                    if consecutive_silence >= silence_frames:
-                        return True
-                else:
-                    consecutive_silence = 0
-        
-        return False
+        # 多チャンネルは全チャンネルをまとめて1フレームとする
+        samples = np.ascontiguousarray(audio_data, dtype=np.float32).reshape(-1)
+        width = frame_length * (len(samples) // len(audio_data))
+        return has_silent_run(samples, width, silence_threshold, silence_frames)
     
     def stream_audio_realtime(self, 
                              callback: Callable[[np.ndarray], bool],
@@ -281,35 +366,22 @@ class AudioInputHandler:
         print("🔄 リアルタイム音声ストリーミング開始")
         
         chunk_samples = int(self.sample_rate * chunk_duration)
-        buffer = np.array([])
         
         self.is_recording = True
         
-        with sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=self.channels,
-            callback=self.audio_callback,
-            blocksize=self.chunk_size
-        ):
+        # チャンク単位のブロッキング読み出し（キュー経由の受け渡し・バッファの結合を行わない）
+        with self._recording_stream() as stream:
             while self.is_recording:
                 try:
-                    # キューからデータを取得
-                    data = self.audio_queue.get(timeout=0.05)
-                    buffer = np.concatenate([buffer, data.flatten()])
+                    data, overflowed = stream.read(chunk_samples)
+                    if overflowed:
+                        print("音声入力エラー: input overflow")
                     
-                    # チャンクサイズに達したら処理
-                    while len(buffer) >= chunk_samples:
-                        chunk = buffer[:chunk_samples]
-                        buffer = buffer[chunk_samples:]
+                    # コールバック実行
+                    continue_streaming = callback(data.reshape(-1))
+                    if not continue_streaming:
+                        self.is_recording = False
                         
-                        # コールバック実行
-                        continue_streaming = callback(chunk)
-                        if not continue_streaming:
-                            self.is_recording = False
-                            break
-                            
-                except queue.Empty:
-                    continue
                 except Exception as e:
                     print(f"ストリーミングエラー: {e}")
                     break
@@ -330,25 +402,30 @@ class AudioInputHandler:
             (ウェイクワード検出, 認識テキスト, 音声データ)
         """
         detected_text = ""
-        captured_audio = np.array([])
         wake_word_found = False
         
+        # キャプチャ用バッファを事前確保（チャンクごとの結合・コピーを避ける）
+        captured = np.zeros(int(self.sample_rate * (max_capture_time + 1)) * self.channels, dtype=np.float32)
+        written = 0
+        
         start_time = time.time()
         
         def process_chunk(chunk: np.ndarray) -> bool:
-            nonlocal detected_text, captured_audio, wake_word_found
+            nonlocal detected_text, written, wake_word_found
             
             # 音声データを蓄積
-            captured_audio = np.concatenate([captured_audio, chunk])
+            end = min(written + len(chunk), len(captured))
+            captured[written:end] = chunk[:end - written]
+            written = end
             
-            # 最大時間チェック
-            if time.time() - start_time > max_capture_time:
+            # 最大時間チェック（バッファが満杯の場合も終了）
+            if time.time() - start_time > max_capture_time or written == len(captured):
                 return False
             
             # 一定量のデータが蓄積されたらウェイクワード検出を試行
-            if len(captured_audio) > self.sample_rate * 1.0:  # 1秒以上
+            if written > self.sample_rate * 1.0:  # 1秒以上
                 try:
-                    found, text = wake_word_detector(captured_audio)
+                    found, text = wake_word_detector(captured[:written])
                     if found:
                         detected_text = text
                         wake_word_found = True
@@ -360,7 +437,7 @@ class AudioInputHandler:
         
         self.stream_audio_realtime(process_chunk, chunk_duration=0.1)
         
-        return wake_word_found, detected_text, captured_audio
+        return wake_word_found, detected_text, captured[:written]
 
 
 def test_audio_input():
@@ -4,20 +4,52 @@
 キャッシュシステムによる高速化対応
 """
 
-import pyttsx3
 import threading
+import queue
 import logging
-from typing import Optional, Dict, Any
+import re
+import hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterable, Iterator, List
 import time
 import os
+import io
+import wave
+import numpy as np
 
 try:
+    import pythoncom
     import win32com.client
     WINDOWS_SPEECH_AVAILABLE = True
 except ImportError:
     WINDOWS_SPEECH_AVAILABLE = False
 
-from .audio_cache import AudioCache
+# pygame再生（オプション、生PCM再生できない場合のフォールバック）
+try:
+    import pygame
+    PYGAME_AVAILABLE = True
+except ImportError:
+    PYGAME_AVAILABLE = False
+
+# Windows標準の再生API（オプション、メモリ上のWAVを直接再生するフォールバック）
+try:
+    import winsound
+    WINSOUND_AVAILABLE = True
+except ImportError:
+    WINSOUND_AVAILABLE = False
+
+# 生PCM再生（オプション、キャッシュ音声をデコードせずに出力）
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except ImportError:
+    SOUNDDEVICE_AVAILABLE = False
+
+from .audio_cache import AudioCache, parse_wav_header
+from .audio_engine import get_engine, get_voices, get_voices_by_lang
+from .dsp_kernels import find_voiced_bounds
 
 # 効果音システムのインポート
 try:
@@ -26,6 +58,124 @@ try:
 except ImportError:
     SOUND_EFFECTS_AVAILABLE = False
 
+# SAPI SpeechVoiceSpeakFlags
+SVSF_DEFAULT = 0
+SVSF_FLAGS_ASYNC = 1
+SVSF_PURGE_BEFORE_SPEAK = 2
+SVSF_IS_NOT_XML = 16  # テキストをSAPI XMLとして解釈しない（読み上げごとのXML解析を省く）
+
+# SAPIの同期読み上げで完了を待つ最大時間（ミリ秒）
+SAPI_WAIT_TIMEOUT_MS = 30000
+
+# SAPI SpeechAudioFormatType（16kHz 16bit モノラル）
+SAFT_16KHZ_16BIT_MONO = 18
+
+# SAPI SpeechStreamFileMode（新規作成・書き込み）
+SSFM_CREATE_FOR_WRITE = 3
+
+# 常駐PCM出力ストリームへの書き込み単位（フレーム数、割り込みの確認間隔を兼ねる）
+PCM_WRITE_FRAMES = 1024
+
+# 無音トリミング設定（int16振幅のRMS閾値・判定窓・前後に残す余白）
+SILENCE_RMS_THRESHOLD = 200
+SILENCE_WINDOW_MS = 10
+SILENCE_PADDING_MS = 20
+
+# 文末記号（和文・英文・改行）の直後で分割するパターン
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[。．.!?！？\n])\s*')
+# 最初の文を読点で区切り、再生開始を早めるためのパターン
+_CLAUSE_SPLIT_RE = re.compile(r'(?<=[、，,])\s*')
+
+# 読み上げから除外する行（MCP STDERR・デバッグログ・HTTPログなど）。全パターンを1回の走査で照合
+_NOISE_LINE_RE = re.compile('|'.join([
+    r'^MCP STDERR',
+    r'MCP STDERR.*?:',
+    r'^\[DEBUG\]',
+    r'^\[I \d{4}-\d{2}-\d{2}',
+    r'^Flushing log events',
+    r'HTTP Request:',
+    r'Processing request of type',
+    r'HTTP/1\.1 \d+',
+    r'httpx\]',
+    r'mcp\.server\.lowlevel\.server\]',
+    r'Home Assistant\):',
+    r'httpcore\]',
+    r'Server\):',
+    r'Received RPC response',
+    r'GET http://homeassistant',  # Home Assistant関連
+    r'POST http://homeassistant',  # Home Assistant関連
+    r'\[I \d{4}-\d{2}-\d{2}.*?\]',  # タイムスタンプログ
+    r'01[A-Z0-9]{20,}',  # セッションID等の長い英数字文字列
+]), re.IGNORECASE)
+# 行内に残ったノイズ（単語レベル、除去後に次のパターンが一致する場合があるため順に適用）
+_NOISE_FRAGMENT_RES = (
+    re.compile(r'MCP STDERR.*?:', re.IGNORECASE),
+    re.compile(r'\[I \d{4}-\d{2}-\d{2}.*?\]'),
+    re.compile(r'HTTP Request:.*?"'),
+    re.compile(r'httpx.*?:', re.IGNORECASE),
+    re.compile(r'Home Assistant.*?:', re.IGNORECASE),
+    re.compile(r'GET http://.*?"'),
+    re.compile(r'POST http://.*?"'),
+    re.compile(r'01[A-Z0-9]{20,}'),  # セッションID等
+)
+# いずれかの単語レベルのノイズを含むか（検出のみ、除去は上のパターンを順に適用）
+_NOISE_FRAGMENT_ANY_RE = re.compile('|'.join(
+    f'(?i:{p.pattern})' if p.flags & re.IGNORECASE else p.pattern for p in _NOISE_FRAGMENT_RES
+))
+_WHITESPACE_RE = re.compile(r'\s+')
+# まとめる必要のある空白（改行・タブ・全角空白など半角スペース以外、または連続した空白）
+_IRREGULAR_WHITESPACE_RE = re.compile(r'[^\S ]|  ')
+# エコー判定で無視する文字（空白・句読点・記号）
+_ECHO_IGNORED_RE = re.compile(r'[\W_]+')
+
+# 読み上げた文をエコー判定に使う期間（秒、文の再生開始から）
+PLAYBACK_ECHO_WINDOW = 15.0
+
+# 1回の応答で読み上げる最大文字数（長い応答は先頭のみ）
+MAX_SPOKEN_CHARS = 200
+
+
+def _clean_noisy_text(text: str, fallback: str) -> str:
+    """
+    ログ行・単語レベルのノイズを除去して読み上げ用テキストに整形
+
+    Args:
+        text: 元のテキスト
+        fallback: 整形後に空になった場合のテキスト
+
+    Returns:
+        整形されたテキスト（MAX_SPOKEN_CHARSを超える場合は先頭のみ）
+    """
+    # MCP STDERRやデバッグ情報の行を除去
+    clean_lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line and not _NOISE_LINE_RE.search(line):
+            clean_lines.append(line)
+    
+    clean_text = ' '.join(clean_lines)
+    
+    # さらにノイズ除去（単語レベル）
+    for pattern in _NOISE_FRAGMENT_RES:
+        clean_text = pattern.sub('', clean_text)
+    
+    # 複数のスペースを1つにまとめる
+    clean_text = _WHITESPACE_RE.sub(' ', clean_text).strip()
+    
+    # 空の場合のフォールバック
+    if not clean_text:
+        clean_text = fallback
+    
+    # 長すぎる場合は最初の部分のみ使用（短縮）
+    if len(clean_text) > MAX_SPOKEN_CHARS:
+        clean_text = clean_text[:MAX_SPOKEN_CHARS] + "..."
+    
+    return clean_text
+
+
+# 入力文字列 → 整形結果（入力のみで決まるため、繰り返し読み上げる文の整形を省く）
+_clean_noisy_text_cached = lru_cache(maxsize=256)(_clean_noisy_text)
+
 
 class AudioOutputHandler:
     """音声出力を管理するクラス（キャッシュ対応）"""
@@ -71,10 +221,47 @@ class AudioOutputHandler:
             self.audio_cache = AudioCache(cache_phrases, voice_settings)
             # バックグラウンドでキャッシュ生成開始
             self.cache_thread = self.audio_cache.pregenerate_cache()
+            # pyttsx3.init()は同じエンジンを返すため、キャッシュ生成で変わった速度・音量を次回読み上げ時に設定し直す
+            self.audio_cache.ready.add_done_callback(self._invalidate_engine_settings)
         else:
             self.audio_cache = None
             self.cache_thread = None
         
+        # 定型メッセージ用LRUキャッシュ（キー: SHA1(text|voice|rate) → WAVバイト）
+        self.phrase_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self.phrase_cache_size = 100
+        self.phrase_cache_dir = os.path.join("cache", "audio")
+        self.phrase_cache_lock = threading.Lock()
+        self._phrase_synth_lock = threading.Lock()  # 定型メッセージの合成を直列化（検索はブロックしない）
+        # SAPIの音声データ書き出し専用スレッド（COMを初期化し、専用のSpVoiceを所有する）
+        self._render_voice = None  # 書き出しスレッド上でのみ作成・使用
+        self._render_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._render_thread: Optional[threading.Thread] = None
+        self._render_thread_lock = threading.Lock()
+        
+        # 割り込み世代（interrupt()ごとに加算し、再生待ちの文を破棄する）
+        self.interrupt_generation = 0
+        
+        # ストリーミング再生状態（マイク側のエコー判定に使用）
+        self.playback_active = threading.Event()
+        self.playback_idle = threading.Event()  # playback_activeの逆（再生終了を待つ側が使用）
+        self.playback_idle.set()
+        self.recent_playback_texts = deque(maxlen=32)  # (再生開始時刻, 空白・句読点を除いた文)
+        
+        # キャッシュ音声用の常駐PCM出力ストリーム（再生ごとのデバイスオープンを省く）
+        self._pcm_stream = None
+        self._pcm_stream_format = None  # (サンプリングレート, チャンネル数)
+        self._pcm_lock = threading.Lock()
+        
+        # 非同期再生用の常駐PCM書き込みワーカー（再生ごとのスレッド起動を省き、投入順に再生）
+        self._pcm_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pcm_worker: Optional[threading.Thread] = None
+        self._pcm_worker_lock = threading.Lock()
+        
+        # pygameミキサー（sounddeviceで再生できない場合のみ初回使用時に1度だけ初期化）
+        self._mixer_ready = False
+        self._mixer_channel = None
+        
         # 統計情報
         self.stats = {
             "total_outputs": 0,
@@ -99,10 +286,18 @@ class AudioOutputHandler:
                 self.enable_sound_effects = False
                 self.sound_effect_player = None
         
+        # pyttsx3読み上げ用の常駐ワーカー（初回のフォールバック読み上げ時に起動）
+        self._tts_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._tts_worker: Optional[threading.Thread] = None
+        self._tts_worker_lock = threading.Lock()
+        
         # Windows Speech API初期化
+        self._sapi_rate = None  # SAPIに設定済みの速度（変更時のみ設定し直す）
+        self._engine_settings = None  # pyttsx3に設定済みの(速度, 音量)（同上）
         if self.use_windows_speech:
             try:
                 self.win_speech = win32com.client.Dispatch("SAPI.SpVoice")
+                self._configure_sapi_output_format()
                 print(f"Windows Speech API初期化完了")
             except Exception as e:
                 print(f"⚠️ Windows Speech API初期化失敗: {e}")
@@ -111,14 +306,44 @@ class AudioOutputHandler:
         else:
             self.win_speech = None
         
-        # TTS エンジン初期化（フォールバック用）
-        try:
-            self.engine = pyttsx3.init()
-            self._configure_engine()
-            print(f"音声出力初期化完了: 速度={rate}, 音量={volume}")
-        except Exception as e:
-            print(f"⚠️  音声出力初期化エラー: {e}")
-            self.engine = None
+        # TTS エンジン初期化（フォールバック用。SAPIが使える場合は初回のフォールバック時まで遅延）
+        self.engine = None
+        self._engine_init_attempted = False
+        self._engine_init_lock = threading.Lock()
+        if self.win_speech is None:
+            self._ensure_engine()
+    
+    def _ensure_engine(self) -> bool:
+        """
+        pyttsx3エンジンを初期化（初回のみ、失敗した場合は再試行しない）
+        
+        Returns:
+            エンジンが利用可能かどうか
+        """
+        if self.engine is not None:
+            return True
+        
+        with self._engine_init_lock:
+            if not self._engine_init_attempted:
+                self._engine_init_attempted = True
+                try:
+                    self.engine = get_engine()
+                    self._configure_engine()
+                    print(f"音声出力初期化完了: 速度={self.rate}, 音量={self.volume}")
+                except Exception as e:
+                    print(f"⚠️  音声出力初期化エラー: {e}")
+                    self.engine = None
+        
+        return self.engine is not None
+    
+    def is_available(self) -> bool:
+        """
+        読み上げに使える音声エンジンがあるか（SAPIまたはpyttsx3）
+        
+        Returns:
+            読み上げ可能かどうか
+        """
+        return self.win_speech is not None or self._ensure_engine()
     
     def _configure_engine(self):
         """TTSエンジンの設定"""
@@ -130,13 +355,10 @@ class AudioOutputHandler:
             self.engine.stop()
             
             # 音声速度設定
-            self.engine.setProperty('rate', self.rate)
-            
-            # 音量設定（最大値に設定）
-            self.engine.setProperty('volume', 1.0)  # 常に最大音量
+            self._apply_engine_settings()
             
-            # 音声の選択
-            voices = self.engine.getProperty('voices')
+            # 音声の選択（音声一覧は共有キャッシュから取得）
+            voices = get_voices()
             if voices:
                 if self.voice_id:
                     # 指定された音声IDを使用
@@ -147,14 +369,12 @@ class AudioOutputHandler:
                             break
                 else:
                     # 日本語音声を優先的に選択
-                    japanese_voice = None
-                    for voice in voices:
-                        if voice.languages and any('ja' in lang.lower() for lang in voice.languages):
-                            japanese_voice = voice
-                            break
+                    japanese_voice = get_voices_by_lang().get('ja')
+                    if japanese_voice is None:
                         # 代替として女性音声を選択
-                        elif 'female' in voice.name.lower() or 'woman' in voice.name.lower():
-                            japanese_voice = voice
+                        for voice in voices:
+                            if 'female' in voice.name.lower() or 'woman' in voice.name.lower():
+                                japanese_voice = voice
                     
                     if japanese_voice:
                         self.engine.setProperty('voice', japanese_voice.id)
@@ -162,20 +382,93 @@ class AudioOutputHandler:
                     else:
                         print("デフォルト音声を使用")
             
-            # エンジンを再初期化
-            import time
-            time.sleep(0.1)  # 短い待機
-            
         except Exception as e:
             print(f"⚠️  音声エンジン設定エラー: {e}")
-    
+
+    def _configure_sapi_output_format(self):
+        """SAPIの出力フォーマットを16kHz 16bit モノラルに設定（デバイス起動時間の短縮）"""
+        try:
+            audio_stream = self.win_speech.AudioOutputStream
+            audio_stream.Format.Type = SAFT_16KHZ_16BIT_MONO
+            self.win_speech.AllowAudioOutputFormatChangesOnNextSet = False
+            self.win_speech.AudioOutputStream = audio_stream
+        except Exception as e:
+            self.logger.debug(f"SAPI output format not changed: {e}")
+
+    def _apply_engine_settings(self):
+        """pyttsx3の速度・音量を読み上げ用の値に合わせる（値が変わった場合のみ設定し直す）"""
+        settings = (min(400, max(150, self.rate)), 1.0)  # 速度は150-400の範囲で制限、音量は常に最大
+        if settings != self._engine_settings:
+            self.engine.setProperty('rate', settings[0])
+            self.engine.setProperty('volume', settings[1])
+            self._engine_settings = settings
+
+    def _invalidate_engine_settings(self, *_):
+        """pyttsx3の設定済み速度・音量を破棄（他の利用者がエンジンの設定を変更した場合）"""
+        self._engine_settings = None
+
+    def _apply_sapi_rate(self):
+        """SAPIの読み上げ速度を現在のrateに合わせる（値が変わった場合のみCOM呼び出しを行う）"""
+        sapi_rate = min(10, max(-10, (self.rate - 200) // 20))  # -10〜10の範囲で調整
+        if sapi_rate != self._sapi_rate:
+            self.win_speech.Rate = sapi_rate
+            self._sapi_rate = sapi_rate
+
+    def warmup(self) -> bool:
+        """
+        音声エンジンのウォームアップ（無音の合成でドライバ・音声データを常駐させる）
+
+        初回の読み上げで発生するSAPI5のロード待ちを起動時に済ませておく
+
+        Returns:
+            ウォームアップに成功したかどうか
+        """
+        start_time = time.time()
+        warmed = False
+
+        # Windows Speech API（音量0で空読み上げ）
+        if self.use_windows_speech and self.win_speech:
+            try:
+                self._apply_sapi_rate()
+                original_volume = self.win_speech.Volume
+                self.win_speech.Volume = 0
+                self.win_speech.Speak(" ", SVSF_DEFAULT)
+                self.win_speech.Volume = original_volume
+                warmed = True
+            except Exception as e:
+                print(f"⚠️ Windows Speech APIウォームアップ失敗: {e}")
+
+        # pyttsx3エンジン（作成済みの場合のみ。SAPI利用時は初回のフォールバックまで作成しない）
+        if self.engine:
+            try:
+                self._apply_engine_settings()
+                self.engine.setProperty('volume', 0.0)
+                self.engine.say(" ")
+                self.engine.runAndWait()
+                self.engine.setProperty('volume', 1.0)
+                warmed = True
+            except Exception as e:
+                print(f"⚠️ pyttsx3ウォームアップ失敗: {e}")
+
+        # キャッシュ音声用の出力デバイスを先に開いておく（SAPI出力と同じ16kHz モノラル）
+        if SOUNDDEVICE_AVAILABLE:
+            try:
+                with self._pcm_lock:
+                    self._get_pcm_stream(16000, 1)
+            except Exception as e:
+                self.logger.debug(f"PCM output stream not opened: {e}")
+
+        if warmed:
+            print(f"🔥 音声エンジンウォームアップ完了 ({time.time() - start_time:.2f}秒)")
+        return warmed
+
     def get_available_voices(self) -> list:
         """利用可能な音声一覧を取得"""
-        if not self.engine:
+        if not self._ensure_engine():
             return []
             
         try:
-            voices = self.engine.getProperty('voices')
+            voices = get_voices()
             voice_list = []
             
             print("\n=== 利用可能な音声 ===")
@@ -220,29 +513,9 @@ class AudioOutputHandler:
             if not clean_text.strip():
                 print("⚠️  クリーン後のテキストが空です")
                 return False
-            
-            # キャッシュから音声を取得試行
-            if self.audio_cache:
-                cached_audio = self.audio_cache.get_cached_audio(clean_text)
-                if cached_audio:
-                    self.stats["cache_hits"] += 1
-                    print("⚡ キャッシュから音声再生")
-                    # キャッシュされた音声を再生
-                    cache_success = self._play_cached_audio(cached_audio, blocking)
-                    if cache_success:
-                        return True
-                    else:
-                        print("⚠️ キャッシュ再生失敗、通常の音声合成にフォールバック")
-                        self.stats["cache_misses"] += 1
-                else:
-                    self.stats["cache_misses"] += 1
-            else:
-                # キャッシュが無効の場合
-                self.stats["cache_misses"] += 1
-            
-            # キャッシュにない場合は通常の音声合成
-            return self._synthesize_and_play(clean_text, blocking)
-            
+
+            return self._play_clean_text(clean_text, blocking)
+
         except Exception as e:
             print(f"❌ 音声出力エラー: {e}")
             self.logger.error(f"Speech output error: {e}")
@@ -251,13 +524,528 @@ class AudioOutputHandler:
             # 処理時間を記録
             processing_time = time.time() - start_time
             self.stats["total_processing_time"] += processing_time
-    
+
+    def _play_clean_text(self, clean_text: str, blocking: bool = True) -> bool:
+        """
+        クリーンアップ済みテキストを再生（キャッシュ優先、なければ音声合成）
+
+        Args:
+            clean_text: クリーンアップされたテキスト
+            blocking: 同期再生するか
+
+        Returns:
+            再生成功したかどうか
+        """
+        # 事前合成済みの定型メッセージならメモリ上の音声をそのまま再生
+        phrase_audio = self._lookup_phrase_audio(clean_text)
+        if phrase_audio is not None:
+            self.stats["cache_hits"] += 1
+            if self._play_cached_audio(phrase_audio, blocking):
+                return True
+
+        # キャッシュから音声を取得試行（完全一致のみ。ストリーミングの断片に別のフレーズを流さない）
+        if self.audio_cache:
+            cached_audio = self.audio_cache.get_cached_audio(clean_text)
+            if cached_audio:
+                self.stats["cache_hits"] += 1
+                print("⚡ キャッシュから音声再生")
+                # キャッシュされた音声を再生
+                cache_success = self._play_cached_audio(cached_audio, blocking)
+                if cache_success:
+                    return True
+                else:
+                    print("⚠️ キャッシュ再生失敗、通常の音声合成にフォールバック")
+                    self.stats["cache_misses"] += 1
+            else:
+                self.stats["cache_misses"] += 1
+        else:
+            # キャッシュが無効の場合
+            self.stats["cache_misses"] += 1
+
+        # キャッシュにない場合は通常の音声合成
+        return self._synthesize_and_play(clean_text, blocking)
+
+    def _phrase_cache_key(self, clean_text: str) -> str:
+        """定型メッセージキャッシュのキー（テキスト・音声・速度のSHA1）"""
+        raw = f"{clean_text}|{self.voice_id}|{self.rate}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _lookup_phrase_audio(self, clean_text: str) -> Optional[bytes]:
+        """
+        メモリ上の定型メッセージ音声を検索（合成・ディスク読み込みは行わない）
+
+        Args:
+            clean_text: クリーンアップされたテキスト
+
+        Returns:
+            WAV音声データ（キャッシュにない場合はNone）
+        """
+        if not self.phrase_cache:
+            return None
+
+        key = self._phrase_cache_key(clean_text)
+        with self.phrase_cache_lock:
+            audio_data = self.phrase_cache.get(key)
+            if audio_data is not None:
+                self.phrase_cache.move_to_end(key)
+            return audio_data
+
+    def _get_phrase_audio(self, clean_text: str) -> Optional[bytes]:
+        """
+        定型メッセージの音声データを取得（メモリ → ディスク → 新規合成の順）
+
+        Args:
+            clean_text: クリーンアップされたテキスト
+
+        Returns:
+            WAV音声データ（合成できない場合はNone）
+        """
+        key = self._phrase_cache_key(clean_text)
+        audio_data = self._lookup_phrase_audio(clean_text)
+        if audio_data is not None:
+            return audio_data
+
+        # 合成・ファイル読み込みはphrase_cache_lockの外で行い、読み上げ中の検索を待たせない
+        # （同じファイルへの同時書き込みを避けるため、合成どうしは直列にする）
+        with self._phrase_synth_lock:
+            with self.phrase_cache_lock:
+                audio_data = self.phrase_cache.get(key)
+            if audio_data is not None:
+                return audio_data
+
+            cache_file = os.path.join(self.phrase_cache_dir, f"phrase_{key}.wav")
+            try:
+                if not os.path.exists(cache_file):
+                    os.makedirs(self.phrase_cache_dir, exist_ok=True)
+                    if not self._render_phrase_file(clean_text, cache_file):
+                        if not self._ensure_engine():
+                            return None
+                        self._apply_engine_settings()
+                        self.engine.save_to_file(clean_text, cache_file)
+                        self.engine.runAndWait()
+                    print(f"🎵 定型メッセージ音声生成: {clean_text[:30]}")
+
+                with open(cache_file, 'rb') as f:
+                    audio_data = f.read()
+            except Exception as e:
+                self.logger.warning(f"Phrase cache synthesis failed: {e}")
+                return None
+
+            if not audio_data:
+                return None
+
+            # 先頭・末尾の無音を除去してからメモリに保持
+            audio_data = self._trim_silence(audio_data)
+
+            with self.phrase_cache_lock:
+                self.phrase_cache[key] = audio_data
+                if len(self.phrase_cache) > self.phrase_cache_size:
+                    self.phrase_cache.popitem(last=False)
+            return audio_data
+
+    def _run_on_render_thread(self, func, *args):
+        """
+        SAPI書き出しスレッドで関数を実行し、結果を待つ
+
+        SAPIのCOMオブジェクトはアパートメントスレッドモデルのため、
+        SpVoice・ストリームの作成から合成までを同じスレッド上で行う
+
+        Args:
+            func: 書き出しスレッドで実行する関数
+            *args: 関数の引数
+
+        Returns:
+            関数の戻り値（例外は呼び出し側で再送出）
+        """
+        with self._render_thread_lock:
+            if self._render_thread is None:
+                self._render_thread = threading.Thread(target=self._render_thread_loop, name="sapi-render", daemon=True)
+                self._render_thread.start()
+            future = Future()
+            self._render_queue.put((func, args, future))
+        return future.result()
+
+    def _render_thread_loop(self):
+        """SAPI書き出しスレッド（キューの処理を1つずつ実行し、Noneで終了）"""
+        pythoncom.CoInitialize()
+        try:
+            while True:
+                item = self._render_queue.get()
+                if item is None:
+                    break
+
+                func, args, future = item
+                try:
+                    future.set_result(func(*args))
+                except Exception as e:
+                    future.set_exception(e)
+                item = func = args = future = None
+        finally:
+            self._render_voice = None
+            pythoncom.CoUninitialize()
+
+    def _stop_render_thread(self):
+        """SAPI書き出しスレッドを終了（未処理の書き出しは実行してから終了）"""
+        with self._render_thread_lock:
+            thread = self._render_thread
+            if thread is None:
+                return
+            self._render_queue.put(None)
+            self._render_thread = None
+        thread.join(timeout=5.0)
+
+    def _render_to_stream(self, clean_text: str, stream):
+        """
+        書き出し専用のSAPI音声でテキストを出力ストリームへ合成（書き出しスレッド上でのみ呼び出す）
+
+        Args:
+            clean_text: クリーンアップされたテキスト
+            stream: 出力先のSAPIストリーム（SpFileStream・SpMemoryStream）
+        """
+        if self._render_voice is None:
+            self._render_voice = win32com.client.Dispatch("SAPI.SpVoice")
+        sapi_rate = min(10, max(-10, (self.rate - 200) // 20))
+        if self._render_voice.Rate != sapi_rate:
+            self._render_voice.Rate = sapi_rate
+
+        self._render_voice.AudioOutputStream = stream
+        self._render_voice.Speak(clean_text, SVSF_IS_NOT_XML)
+
+    def _render_sapi_audio(self, clean_text: str) -> Optional[bytes]:
+        """
+        SAPIの合成音声をSpMemoryStreamで受け取り、先頭・末尾の無音を除去したWAVにする
+
+        SAPI5の音声は読み上げごとに前後へ無音を付加するため、
+        デバイスへ直接出力するよりも最初の音が出るまでが短くなる
+
+        Args:
+            clean_text: クリーンアップされたテキスト
+
+        Returns:
+            16kHz 16bit モノラルのWAVデータ（合成できない場合はNone）
+        """
+        try:
+            frames = self._run_on_render_thread(self._render_to_memory, clean_text)
+        except Exception as e:
+            self.logger.warning(f"SAPI memory rendering failed: {e}")
+            return None
+
+        if not frames:
+            return None
+
+        output = io.BytesIO()
+        with wave.open(output, 'wb') as wav_out:
+            wav_out.setnchannels(1)
+            wav_out.setsampwidth(2)
+            wav_out.setframerate(16000)
+            wav_out.writeframes(frames)
+        return self._trim_silence(output.getvalue())
+
+    def _render_to_memory(self, clean_text: str) -> bytes:
+        """
+        SpMemoryStreamへ合成してPCMデータを取り出す（書き出しスレッド上でのみ呼び出す）
+
+        Args:
+            clean_text: クリーンアップされたテキスト
+
+        Returns:
+            16kHz 16bit モノラルのPCMデータ
+        """
+        memory_stream = win32com.client.Dispatch("SAPI.SpMemoryStream")
+        memory_stream.Format.Type = SAFT_16KHZ_16BIT_MONO
+        self._render_to_stream(clean_text, memory_stream)
+        return bytes(memory_stream.GetData())
+
+    def _render_phrase_file(self, clean_text: str, cache_file: str) -> bool:
+        """
+        SAPIのSpFileStreamで定型メッセージをWAVファイルへ書き出す
+
+        読み上げ用のSpVoiceや共有pyttsx3エンジンとは別の音声オブジェクトを使うため、
+        再生中・フォールバック読み上げ中でも並行して事前合成できる
+
+        Args:
+            clean_text: クリーンアップされたテキスト
+            cache_file: 書き出し先のWAVファイルパス
+
+        Returns:
+            書き出しに成功したかどうか（SAPIが使えない場合はFalse）
+        """
+        if not self.use_windows_speech:
+            return False
+
+        try:
+            self._run_on_render_thread(self._write_phrase_file, clean_text, cache_file)
+            return True
+        except Exception as e:
+            self.logger.warning(f"SAPI phrase rendering failed: {e}")
+            return False
+
+    def _write_phrase_file(self, clean_text: str, cache_file: str):
+        """
+        SpFileStreamを開いてWAVファイルへ合成（書き出しスレッド上でのみ呼び出す）
+
+        Args:
+            clean_text: クリーンアップされたテキスト
+            cache_file: 書き出し先のWAVファイルパス
+        """
+        file_stream = win32com.client.Dispatch("SAPI.SpFileStream")
+        file_stream.Format.Type = SAFT_16KHZ_16BIT_MONO
+        file_stream.Open(cache_file, SSFM_CREATE_FOR_WRITE, False)
+        try:
+            self._render_to_stream(clean_text, file_stream)
+        except Exception:
+            # 書きかけのファイルを残すと次回以降そのまま読み込まれるため削除
+            file_stream.Close()
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            raise
+        file_stream.Close()
+
+    def _trim_silence(self, wav_data: bytes) -> bytes:
+        """
+        WAV音声の先頭・末尾の無音を除去（SAPI5が付加する無音による遅延を削減）
+
+        Args:
+            wav_data: 16bit PCMのWAVバイトデータ
+
+        Returns:
+            無音を除去したWAVバイトデータ（処理できない形式の場合は元のデータ）
+        """
+        try:
+            with wave.open(io.BytesIO(wav_data), 'rb') as wav_in:
+                params = wav_in.getparams()
+                frames = wav_in.readframes(params.nframes)
+
+            if params.sampwidth != 2 or not frames:
+                return wav_data
+
+            channels = params.nchannels
+            samples = np.frombuffer(frames, dtype=np.int16)
+            samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+
+            # 移動窓RMSで有音区間を検出（複数チャンネルは平均してモノラル化）
+            mono = samples[:, 0] if channels == 1 else samples.mean(axis=1)
+            window = params.framerate * SILENCE_WINDOW_MS // 1000
+            bounds = find_voiced_bounds(mono, window, SILENCE_RMS_THRESHOLD)
+            if bounds is None:
+                return wav_data
+
+            padding = params.framerate * SILENCE_PADDING_MS // 1000
+            start = max(0, bounds[0] - padding)
+            end = min(len(samples), bounds[1] + padding)
+            if start == 0 and end == len(samples):
+                return wav_data
+
+            output = io.BytesIO()
+            with wave.open(output, 'wb') as wav_out:
+                wav_out.setnchannels(channels)
+                wav_out.setsampwidth(params.sampwidth)
+                wav_out.setframerate(params.framerate)
+                wav_out.writeframes(samples[start:end].tobytes())
+            return output.getvalue()
+
+        except Exception as e:
+            self.logger.debug(f"Silence trimming skipped: {e}")
+            return wav_data
+
+    def speak_cached(self, text: str, blocking: bool = True) -> bool:
+        """
+        定型メッセージをキャッシュ経由で読み上げ
+
+        初回のみWAVに合成し、以降はメモリ（またはディスク）上の音声を再生する。
+        Geminiの応答など毎回異なるテキストにはspeak_textを使用すること
+
+        Args:
+            text: 読み上げる定型テキスト
+            blocking: 同期再生するか
+
+        Returns:
+            再生成功したかどうか
+        """
+        clean_text = self._clean_text(text)
+        if not clean_text.strip():
+            return False
+
+        audio_data = self._get_phrase_audio(clean_text)
+        if audio_data is not None:
+            self.stats["total_outputs"] += 1
+            self.stats["cache_hits"] += 1
+            if self._play_cached_audio(audio_data, blocking):
+                return True
+            print("⚠️ 定型メッセージ再生失敗、通常の音声合成にフォールバック")
+
+        return self.speak_text(text, blocking)
+
+    def phrase_duration(self, text: str) -> float:
+        """
+        事前合成済み定型メッセージの再生時間を取得
+
+        Args:
+            text: 定型テキスト
+
+        Returns:
+            再生時間（秒）。キャッシュにない・長さが分からない場合は0.0
+        """
+        audio_data = self._lookup_phrase_audio(self._clean_text(text))
+        if audio_data is None:
+            return 0.0
+
+        try:
+            with wave.open(io.BytesIO(audio_data), 'rb') as wav_in:
+                return wav_in.getnframes() / float(wav_in.getframerate())
+        except Exception:
+            return 0.0
+
+    def precache_phrases(self, phrases: Iterable[str]):
+        """
+        定型メッセージを事前に合成してキャッシュに載せる
+
+        Args:
+            phrases: 事前合成するテキストのイテラブル
+        """
+        for phrase in phrases:
+            clean_text = self._clean_text(phrase)
+            if clean_text.strip():
+                self._get_phrase_audio(clean_text)
+
+    def split_sentences(self, text: str) -> List[str]:
+        """
+        応答テキストを文単位に分割（ストリーミング再生用）
+
+        最初の文は読点でさらに区切り、最初の音が出るまでの時間を短くする
+
+        Args:
+            text: 元のテキスト
+
+        Returns:
+            クリーンアップ済みの文のリスト
+        """
+        clean_text = self._clean_text(text)
+        sentences = [s for s in _SENTENCE_SPLIT_RE.split(clean_text) if s.strip()]
+
+        if sentences:
+            head = [s for s in _CLAUSE_SPLIT_RE.split(sentences[0], maxsplit=1) if s.strip()]
+            sentences = head + sentences[1:]
+
+        return sentences
+
+    def stream_sentences(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        逐次届くテキスト断片から、完成した文を順に取り出す（応答の受信中に読み上げを始めるため）
+
+        最初の文は読点でも区切り、合計がMAX_SPOKEN_CHARSに達した時点で打ち切る
+
+        Args:
+            chunks: 応答テキストの断片のイテラブル（GeminiClient.stream_commandなど）
+
+        Yields:
+            クリーンアップ済みの文
+        """
+        buffer = ""
+        spoken = 0
+        first = True
+
+        def finish(parts):
+            nonlocal spoken, first
+            for part in parts:
+                sentence = self._clean_text(part, fallback="")
+                if not sentence:
+                    continue
+                if spoken >= MAX_SPOKEN_CHARS:
+                    return False
+                spoken += len(sentence)
+                first = False
+                yield sentence
+            return True
+
+        for chunk in chunks:
+            buffer += chunk
+            parts = _SENTENCE_SPLIT_RE.split(buffer)
+            buffer = parts.pop()  # 末尾は未完成の文
+
+            # 最初の文がまだ完成していなければ読点までを先に読み上げる
+            if first and not parts:
+                head = _CLAUSE_SPLIT_RE.split(buffer, maxsplit=1)
+                if len(head) == 2:
+                    parts, buffer = [head[0]], head[1]
+
+            if not (yield from finish(parts)):
+                return
+
+        yield from finish([buffer])
+
+    def speak_stream(self, sentences: Iterable[str], blocking: bool = True) -> bool:
+        """
+        文単位のストリーミング読み上げ
+
+        前の文を再生している間に次の文をキューへ投入するため、
+        応答全体ではなく最初の文の合成が終わった時点で再生が始まる
+
+        Args:
+            sentences: 読み上げる文のイテラブル（split_sentencesの結果など）
+            blocking: 全ての文の読み上げ完了まで待機するか
+
+        Returns:
+            再生を開始できたかどうか
+        """
+        sentence_iter = iter(sentences)
+        first_sentence = next(sentence_iter, None)
+        if first_sentence is None:
+            print("⚠️  読み上げるテキストがありません")
+            return False
+
+        self.stats["total_outputs"] += 1
+        sentence_queue: queue.Queue = queue.Queue(maxsize=2)
+        generation = self.interrupt_generation
+
+        def playback_worker():
+            self.playback_idle.clear()
+            self.playback_active.set()
+            try:
+                while True:
+                    sentence = sentence_queue.get()
+                    if sentence is None:
+                        break
+                    if generation != self.interrupt_generation:
+                        continue  # 割り込み済み：残りの文は読み上げない
+                    start_time = time.time()
+                    try:
+                        print(f"🔊 音声出力(ストリーミング): '{sentence[:50]}{'...' if len(sentence) > 50 else ''}'")
+                        self.recent_playback_texts.append((time.monotonic(), _ECHO_IGNORED_RE.sub('', sentence).casefold()))
+                        self._play_clean_text(sentence, blocking=True)
+                    except Exception as e:
+                        print(f"❌ ストリーミング音声出力エラー: {e}")
+                        self.logger.error(f"Streaming speech output error: {e}")
+                    finally:
+                        self.stats["total_processing_time"] += time.time() - start_time
+            finally:
+                self.playback_active.clear()
+                self.playback_idle.set()
+
+        def feed_sentences():
+            sentence_queue.put(first_sentence)
+            for sentence in sentence_iter:
+                if sentence.strip():
+                    sentence_queue.put(sentence)
+            sentence_queue.put(None)  # 終端マーカー
+
+        worker = threading.Thread(target=playback_worker, daemon=True)
+        worker.start()
+
+        if blocking:
+            feed_sentences()
+            worker.join()
+        else:
+            threading.Thread(target=feed_sentences, daemon=True).start()
+
+        return True
+
     def _play_cached_audio(self, audio_data: bytes, blocking: bool = True) -> bool:
         """
         キャッシュされた音声データを再生
         
         Args:
-            audio_data: 音声データ
+            audio_data: 音声データ（bytes、またはAudioCacheのmmapなどのバッファ）
             blocking: 同期再生するか
             
         Returns:
@@ -265,38 +1053,163 @@ class AudioOutputHandler:
         """
         print("DEBUG: キャッシュ音声再生開始")
         
-        # 最初にpygameでの再生を試行
+        # 16bit PCMのWAVはヘッダーだけ解析し、PCM部分をそのまま出力（デコード・ミキサー初期化なし）
+        if SOUNDDEVICE_AVAILABLE and self._play_pcm(audio_data, blocking):
+            return True
+        
+        if not PYGAME_AVAILABLE:
+            print("DEBUG: pygameが利用できません、フォールバック再生を使用")
+            # pygameが利用できない場合は一時ファイルで再生
+            return self._play_cached_audio_fallback(audio_data, blocking)
+        
+        # 次にpygameでの再生を試行
         try:
-            import pygame
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            self._ensure_mixer()
             
-            # バイトデータから音声を再生
-            import io
-            audio_buffer = io.BytesIO(audio_data)
-            pygame.mixer.music.load(audio_buffer)
-            pygame.mixer.music.play()
+            # バイトデータから音声を再生（ミキサーは初期化済みのものを使い回す）
+            sound = pygame.mixer.Sound(file=io.BytesIO(audio_data))
+            channel = sound.play()
+            self._mixer_channel = channel
             
             print("DEBUG: pygame音声再生開始")
             
-            if blocking:
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
+            if blocking and channel is not None:
+                # 再生長から終了時刻を求め、終了間際だけ細かく確認する（割り込み停止は0.1秒以内に検知）
+                end_time = time.monotonic() + sound.get_length()
+                while channel.get_busy():
+                    remaining = end_time - time.monotonic()
+                    time.sleep(min(0.1, max(0.005, remaining)))
                 print("DEBUG: pygame音声再生完了")
             
             return True
             
-        except ImportError:
-            print("DEBUG: pygameが利用できません、フォールバック再生を使用")
-            # pygameが利用できない場合は一時ファイルで再生
-            return self._play_cached_audio_fallback(audio_data, blocking)
         except Exception as e:
             print(f"⚠️ pygame音声再生エラー: {e}")
             print("DEBUG: フォールバック再生に切り替え")
             return self._play_cached_audio_fallback(audio_data, blocking)
     
+    def _ensure_mixer(self):
+        """pygameミキサーを初期化（未初期化の場合のみ、効果音側で初期化済みならそれを使う）"""
+        if self._mixer_ready:
+            return
+        if not pygame.mixer.get_init():
+            pygame.mixer.pre_init(22050, -16, 2, 512)
+            pygame.mixer.init()
+        self._mixer_ready = True
+    
+    def _play_pcm(self, audio_data: bytes, blocking: bool = True) -> bool:
+        """
+        WAVデータのPCM部分をsounddeviceで直接再生
+        
+        Args:
+            audio_data: WAVデータ（bytes・mmapなど）
+            blocking: 同期再生するか
+            
+        Returns:
+            再生できた場合True（16bit PCM以外・再生失敗時はFalse）
+        """
+        header = parse_wav_header(audio_data)
+        if header is None:
+            return False
+        
+        channels, sampwidth, framerate, data_offset, data_size = header
+        if sampwidth != 2 or channels < 1 or data_size < sampwidth * channels:
+            return False
+        
+        # バッファを共有するビュー（コピーしない）
+        count = data_size // (sampwidth * channels) * channels
+        samples = np.frombuffer(audio_data, dtype=np.int16, count=count, offset=data_offset)
+        generation = self.interrupt_generation
+        
+        if blocking:
+            return self._write_pcm(samples, framerate, channels, generation)
+        
+        self._ensure_pcm_worker()
+        self._pcm_queue.put((samples, framerate, channels, generation))
+        return True
+    
+    def _get_pcm_stream(self, framerate: int, channels: int) -> "sd.RawOutputStream":
+        """
+        常駐PCM出力ストリームを取得（フォーマットが変わった場合のみ開き直す）
+        
+        呼び出し側で_pcm_lockを保持すること
+        
+        Args:
+            framerate: サンプリングレート
+            channels: チャンネル数
+            
+        Returns:
+            開始済みの出力ストリーム
+        """
+        if self._pcm_stream is not None and self._pcm_stream_format == (framerate, channels):
+            return self._pcm_stream
+        
+        self._close_pcm_stream()
+        stream = sd.RawOutputStream(samplerate=framerate, channels=channels, dtype='int16')
+        stream.start()
+        self._pcm_stream = stream
+        self._pcm_stream_format = (framerate, channels)
+        return stream
+    
+    def _close_pcm_stream(self):
+        """常駐PCM出力ストリームを閉じる（呼び出し側で_pcm_lockを保持すること）"""
+        if self._pcm_stream is None:
+            return
+        try:
+            self._pcm_stream.close()
+        except Exception as e:
+            self.logger.debug(f"PCM output stream close failed: {e}")
+        self._pcm_stream = None
+        self._pcm_stream_format = None
+    
+    def _ensure_pcm_worker(self):
+        """PCM書き込みワーカーを起動（初回のみ）"""
+        with self._pcm_worker_lock:
+            if self._pcm_worker is None:
+                self._pcm_worker = threading.Thread(target=self._pcm_worker_loop, name="pcm-playback", daemon=True)
+                self._pcm_worker.start()
+    
+    def _pcm_worker_loop(self):
+        """PCM書き込みワーカー（キューの音声を1つずつ出力ストリームへ書き込み、Noneで終了）"""
+        while True:
+            item = self._pcm_queue.get()
+            if item is None:
+                break
+            self._write_pcm(*item)
+            # 次の待機中にサンプル（キャッシュのmmapを参照するビュー）を保持し続けないよう解放
+            item = None
+    
+    def _write_pcm(self, samples: np.ndarray, framerate: int, channels: int, generation: int) -> bool:
+        """
+        PCMサンプルを常駐出力ストリームへ書き込む（割り込まれた時点で中断）
+        
+        Args:
+            samples: int16サンプル（インターリーブ済み1次元配列）
+            framerate: サンプリングレート
+            channels: チャンネル数
+            generation: 再生開始時の割り込み世代
+            
+        Returns:
+            書き込みを開始できたかどうか
+        """
+        step = PCM_WRITE_FRAMES * channels
+        try:
+            with self._pcm_lock:
+                stream = self._get_pcm_stream(framerate, channels)
+                for start in range(0, len(samples), step):
+                    if generation != self.interrupt_generation:
+                        break
+                    stream.write(samples[start:start + step])
+            return True
+        except Exception as e:
+            self.logger.debug(f"PCM playback failed: {e}")
+            with self._pcm_lock:
+                self._close_pcm_stream()
+            return False
+    
     def _play_cached_audio_fallback(self, audio_data: bytes, blocking: bool = True) -> bool:
         """
-        キャッシュ音声のフォールバック再生（一時ファイル使用）
+        キャッシュ音声のフォールバック再生（winsoundでメモリ上のWAVを直接再生）
         
         Args:
             audio_data: 音声データ
@@ -305,72 +1218,26 @@ class AudioOutputHandler:
         Returns:
             再生成功したかどうか
         """
+        if not WINSOUND_AVAILABLE or parse_wav_header(audio_data) is None:
+            return False
+        
         print("DEBUG: フォールバック音声再生開始")
         
-        try:
-            import tempfile
-            import subprocess
-            
-            # 一時ファイルに保存
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
-            
-            print(f"DEBUG: 一時ファイル作成: {temp_file_path}")
-            
-            # Windowsの場合はシンプルなPowerShellコマンドで再生
-            if os.name == 'nt':
-                try:
-                    if blocking:
-                        # 同期再生 - SoundPlayerクラスを使用
-                        cmd = f'$player = New-Object System.Media.SoundPlayer; $player.SoundLocation = "{temp_file_path}"; $player.PlaySync()'
-                        result = subprocess.run(["powershell", "-Command", cmd], 
-                                              capture_output=True, text=True, timeout=10)
-                        print(f"DEBUG: PowerShell同期再生完了: {result.returncode}")
-                        
-                        # ファイル削除
-                        try:
-                            os.unlink(temp_file_path)
-                        except:
-                            pass
-                        
-                        return result.returncode == 0
-                    else:
-                        # 非同期再生
-                        cmd = f'$player = New-Object System.Media.SoundPlayer; $player.SoundLocation = "{temp_file_path}"; $player.Play()'
-                        subprocess.Popen(["powershell", "-Command", cmd])
-                        print("DEBUG: PowerShell非同期再生開始")
-                        
-                        # 遅延削除
-                        def delayed_cleanup():
-                            time.sleep(5)
-                            try:
-                                os.unlink(temp_file_path)
-                            except:
-                                pass
-                        threading.Thread(target=delayed_cleanup, daemon=True).start()
-                        
-                        return True
-                        
-                except Exception as e:
-                    print(f"⚠️ PowerShell再生エラー: {e}")
-                    # ファイルクリーンアップ
-                    try:
-                        os.unlink(temp_file_path)
-                    except:
-                        pass
-                    return False
-            else:
-                # Windows以外の場合
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
+        # SND_MEMORYはSND_ASYNCと併用できないため、非同期再生はスレッドで同期再生する
+        wav_bytes = bytes(audio_data)
+        
+        def play():
+            try:
+                winsound.PlaySound(wav_bytes, winsound.SND_MEMORY | winsound.SND_NODEFAULT)
+                return True
+            except Exception as e:
+                print(f"⚠️ フォールバック音声再生エラー: {e}")
                 return False
-            
-        except Exception as e:
-            print(f"⚠️ フォールバック音声再生エラー: {e}")
-            return False
+        
+        if blocking:
+            return play()
+        threading.Thread(target=play, daemon=True).start()
+        return True
     
     def _synthesize_and_play(self, clean_text: str, blocking: bool = True) -> bool:
         """
@@ -389,17 +1256,29 @@ class AudioOutputHandler:
             try:
                 # 音声速度を設定（可能な場合）
                 try:
-                    self.win_speech.Rate = min(10, max(-10, (self.rate - 200) // 20))  # -10〜10の範囲で調整
+                    self._apply_sapi_rate()
                 except:
                     pass  # 設定に失敗しても続行
                 
+                # メモリ上に合成して前後の無音を除去し、常駐PCMストリームで再生
+                if SOUNDDEVICE_AVAILABLE:
+                    generation = self.interrupt_generation
+                    audio_data = self._render_sapi_audio(clean_text)
+                    if generation != self.interrupt_generation:
+                        return True  # 合成中に割り込まれた文は再生しない
+                    if audio_data is not None and self._play_pcm(audio_data, blocking):
+                        return True
+                
                 if blocking:
+                    # 非同期で投入して完了を待つ（interrupt()のパージで待機も解除される）
                     print("DEBUG: Windows Speech API同期再生開始")
-                    self.win_speech.Speak(clean_text, 0)  # 同期フラグ
+                    self.win_speech.Speak(clean_text, SVSF_FLAGS_ASYNC | SVSF_IS_NOT_XML)
+                    self.win_speech.WaitUntilDone(SAPI_WAIT_TIMEOUT_MS)
                     print("DEBUG: Windows Speech API同期再生完了")
                 else:
+                    # 非同期再生（再生中の音声は破棄して割り込む）
                     print("DEBUG: Windows Speech API非同期再生開始")
-                    self.win_speech.Speak(clean_text, 1)  # 非同期フラグ
+                    self.win_speech.Speak(clean_text, SVSF_FLAGS_ASYNC | SVSF_PURGE_BEFORE_SPEAK | SVSF_IS_NOT_XML)
                     print("DEBUG: Windows Speech API非同期再生完了")
                 return True
             except Exception as e:
@@ -407,115 +1286,153 @@ class AudioOutputHandler:
                 # フォールバックでpyttsx3を使用
         
         # pyttsx3エンジンを使用（フォールバック）
-        if not self.engine:
+        if not self._ensure_engine():
             print("❌ 音声エンジンが利用できません")
             return False
         
-        # 高速化のため非同期処理を優先
+        # 読み上げは常駐ワーカーで順に実行（runAndWaitの同時実行を防ぐ）
         print("DEBUG: pyttsx3エンジン使用")
+        self._ensure_tts_worker()
         
-        def speak_async():
-            try:
-                self.engine.stop()
-                # 高速設定
-                self.engine.setProperty('rate', min(400, max(150, self.rate)))  # 150-400の範囲で制限
-                self.engine.setProperty('volume', 1.0)
-                self.engine.say(clean_text)
-                self.engine.runAndWait()
-                print("DEBUG: pyttsx3音声再生完了")
-            except Exception as e:
-                print(f"DEBUG: pyttsx3音声再生エラー: {e}")
+        done = threading.Event() if blocking else None
+        self._tts_queue.put((clean_text, self.interrupt_generation, done))
         
         if blocking:
-            # 同期実行
             print("DEBUG: pyttsx3同期音声再生開始")
-            speak_async()
+            done.wait()
         else:
-            # 非同期実行
             print("DEBUG: pyttsx3非同期音声再生開始")
-            thread = threading.Thread(target=speak_async)
-            thread.daemon = True
-            thread.start()
         
         return True
     
-    def _clean_text(self, text: str) -> str:
+    def _ensure_tts_worker(self):
+        """pyttsx3読み上げワーカーを起動（初回のみ）"""
+        with self._tts_worker_lock:
+            if self._tts_worker is None:
+                self._tts_worker = threading.Thread(target=self._tts_worker_loop, name="tts-fallback", daemon=True)
+                self._tts_worker.start()
+    
+    def _tts_worker_loop(self):
+        """pyttsx3読み上げワーカー（キューの文を1つずつ読み上げ、Noneで終了）"""
+        while True:
+            item = self._tts_queue.get()
+            if item is None:
+                break
+            
+            text, generation, done = item
+            try:
+                # 割り込み済みの文は読み上げない
+                if generation == self.interrupt_generation:
+                    # 速度・音量は変更があった場合のみ設定し直す
+                    self._apply_engine_settings()
+                    self.engine.say(text)
+                    self.engine.runAndWait()
+                    print("DEBUG: pyttsx3音声再生完了")
+            except Exception as e:
+                print(f"DEBUG: pyttsx3音声再生エラー: {e}")
+            finally:
+                if done is not None:
+                    done.set()
+    
+    def _clean_text(self, text: str, fallback: str = "処理が完了しました") -> str:
         """
         テキストをクリーンアップ（読み上げに不適切な部分を除去）
         
         Args:
             text: 元のテキスト
+            fallback: クリーンアップ後に空になった場合のテキスト
             
         Returns:
             クリーンアップされたテキスト
         """
-        import re
-        
-        # MCP STDERRやデバッグ情報を除去
-        lines = text.split('\n')
-        clean_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            
-            # 除外するパターン（より包括的に）
-            skip_patterns = [
-                r'^MCP STDERR',
-                r'MCP STDERR.*?:',
-                r'^\[DEBUG\]',
-                r'^\[I \d{4}-\d{2}-\d{2}',
-                r'^Flushing log events',
-                r'HTTP Request:',
-                r'Processing request of type',
-                r'HTTP/1\.1 \d+',
-                r'httpx\]',
-                r'mcp\.server\.lowlevel\.server\]',
-                r'Home Assistant\):',
-                r'httpcore\]',
-                r'Server\):',
-                r'Processing request of type',
-                r'Received RPC response',
-                r'^\s*$',  # 空行
-                r'GET http://homeassistant',  # Home Assistant関連
-                r'POST http://homeassistant',  # Home Assistant関連
-                r'\[I \d{4}-\d{2}-\d{2}.*?\]',  # タイムスタンプログ
-                r'01[A-Z0-9]{20,}'  # セッションID等の長い英数字文字列
-            ]
-            
-            should_skip = False
-            for pattern in skip_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    should_skip = True
-                    break
-            
-            if not should_skip and line:
-                clean_lines.append(line)
-        
-        clean_text = ' '.join(clean_lines)
+        # 既にクリーンなテキスト（通常の応答文）はそのまま返す
+        if (text and len(text) <= MAX_SPOKEN_CHARS and text == text.strip()
+                and not _IRREGULAR_WHITESPACE_RE.search(text)
+                and not _NOISE_LINE_RE.search(text)
+                and not _NOISE_FRAGMENT_ANY_RE.search(text)):
+            return text
         
-        # さらにノイズ除去（単語レベル）
-        clean_text = re.sub(r'MCP STDERR.*?:', '', clean_text, flags=re.IGNORECASE)
-        clean_text = re.sub(r'\[I \d{4}-\d{2}-\d{2}.*?\]', '', clean_text)
-        clean_text = re.sub(r'HTTP Request:.*?"', '', clean_text)
-        clean_text = re.sub(r'httpx.*?:', '', clean_text, flags=re.IGNORECASE)
-        clean_text = re.sub(r'Home Assistant.*?:', '', clean_text, flags=re.IGNORECASE)
-        clean_text = re.sub(r'GET http://.*?"', '', clean_text)
-        clean_text = re.sub(r'POST http://.*?"', '', clean_text)
-        clean_text = re.sub(r'01[A-Z0-9]{20,}', '', clean_text)  # セッションID等を除去
-        
-        # 複数のスペースを1つにまとめる
-        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-        
-        # 空の場合のフォールバック
-        if not clean_text:
-            clean_text = "処理が完了しました"
-        
-        # 長すぎる場合は最初の部分のみ使用（短縮）
-        if len(clean_text) > 200:
-            clean_text = clean_text[:200] + "..."
-        
-        return clean_text
+        # 定型メッセージなど同じ入力が繰り返されるため、最大テキスト長以下の入力は結果を再利用
+        if len(text) <= self.max_text_length:
+            return _clean_noisy_text_cached(text, fallback)
+        return _clean_noisy_text(text, fallback)
     
+    def is_playing(self) -> bool:
+        """ストリーミング再生中かどうか"""
+        return self.playback_active.is_set()
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        ストリーミング再生の終了を待機（再生していなければ即座に戻る）
+
+        Args:
+            timeout: 最大待機時間（秒）。Noneの場合は無制限
+
+        Returns:
+            再生が終了している場合True（タイムアウトした場合False）
+        """
+        return self.playback_idle.wait(timeout)
+
+    def is_playback_echo(self, text: str) -> bool:
+        """
+        認識されたテキストが再生中の音声の回り込み（エコー）かどうかを判定
+
+        Args:
+            text: マイクから認識されたテキスト
+
+        Returns:
+            直近に読み上げた文（文の区切りをまたぐ場合を含む）の一部と一致する場合True
+        """
+        if not text or not self.is_playing():
+            return False
+
+        heard = _ECHO_IGNORED_RE.sub('', text).casefold()
+        if not heard:
+            return False
+
+        # 一定期間内に読み上げた文を連結して照合（空白・句読点は除いて比較）
+        since = time.monotonic() - PLAYBACK_ECHO_WINDOW
+        spoken = "".join(sentence for played_at, sentence in list(self.recent_playback_texts)
+                         if played_at >= since)
+        return heard in spoken
+
+    def interrupt(self):
+        """
+        再生中・再生待ちの音声を即座に破棄（新しいウェイクワードによる割り込み用）
+        """
+        self.interrupt_generation += 1
+
+        if self.win_speech:
+            try:
+                self.win_speech.Speak("", SVSF_FLAGS_ASYNC | SVSF_PURGE_BEFORE_SPEAK)
+            except Exception as e:
+                self.logger.debug(f"SAPI purge failed: {e}")
+
+        if self.engine:
+            try:
+                self.engine.stop()
+            except Exception as e:
+                self.logger.debug(f"pyttsx3 stop failed: {e}")
+
+        if SOUNDDEVICE_AVAILABLE:
+            try:
+                sd.stop()
+            except Exception as e:
+                self.logger.debug(f"sounddevice stop failed: {e}")
+
+        if WINSOUND_AVAILABLE:
+            try:
+                winsound.PlaySound(None, 0)
+            except Exception:
+                pass
+
+        if PYGAME_AVAILABLE:
+            try:
+                if self._mixer_channel is not None and pygame.mixer.get_init():
+                    self._mixer_channel.stop()
+            except Exception:
+                pass
+
     def stop_speaking(self):
         """読み上げを停止"""
         if self.engine:
@@ -530,7 +1447,7 @@ class AudioOutputHandler:
         self.rate = rate
         if self.engine:
             try:
-                self.engine.setProperty('rate', rate)
+                self._apply_engine_settings()
                 print(f"音声速度を {rate} WPM に変更しました")
             except Exception as e:
                 print(f"音声速度変更エラー: {e}")
@@ -541,6 +1458,7 @@ class AudioOutputHandler:
         if self.engine:
             try:
                 self.engine.setProperty('volume', self.volume)
+                self._invalidate_engine_settings()
                 print(f"音量を {self.volume} に変更しました")
             except Exception as e:
                 print(f"音量変更エラー: {e}")
@@ -580,6 +1498,9 @@ class AudioOutputHandler:
             stats["cache_hit_rate"] = 0.0
             stats["average_processing_time"] = 0.0
         
+        # 定型メッセージキャッシュのエントリ数
+        stats["phrase_cache_entries"] = len(self.phrase_cache)
+        
         # キャッシュシステムの統計も追加
         if self.audio_cache:
             cache_stats = self.audio_cache.get_cache_stats()
@@ -647,8 +1568,23 @@ class AudioOutputHandler:
         try:
             if self.engine:
                 self.engine.stop()
+            # 再生中・再生待ちのPCMは破棄し、書き込みワーカーの終了を待つ
+            self.interrupt_generation += 1
+            if self._tts_worker is not None:
+                self._tts_queue.put(None)
+            if self._pcm_worker is not None:
+                self._pcm_queue.put(None)
+                self._pcm_worker.join(timeout=2.0)
+                self._pcm_worker = None
+            with self._pcm_lock:
+                self._close_pcm_stream()
+            self._stop_render_thread()
+            # キャッシュ音声のマップは再生側のビューを解放してから閉じる
             if self.audio_cache:
                 self.audio_cache.clear_cache()
+            if self._mixer_ready:
+                pygame.mixer.quit()
+                self._mixer_ready = False
             if self.sound_effect_player:
                 self.sound_effect_player.cleanup()
             print("🔒 音声出力システム終了")
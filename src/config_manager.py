@@ -5,7 +5,73 @@ config.jsonからの設定読み込みとデフォルト値管理
 
 import json
 import os
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+
+# 高速JSONパーサー（オプション、未インストール時は標準のjsonを使用）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _load_json(path: str) -> Any:
+    """
+    JSONファイルを読み込み
+
+    Args:
+        path: ファイルパス
+
+    Returns:
+        読み込んだオブジェクト
+    """
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _dump_json(obj: Any, path: str):
+    """
+    オブジェクトをJSONファイルに書き込み（インデント2、非ASCII文字はそのまま）
+
+    Args:
+        obj: 書き込むオブジェクト
+        path: ファイルパス
+    """
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+@lru_cache(maxsize=256)
+def _split_key_path(key_path: str) -> Tuple[str, ...]:
+    """ドット記法のキーパスを分割（同じパスは繰り返し参照されるため結果を再利用）"""
+    return tuple(key_path.split('.'))
+
+
+_MISSING = object()
+
+
+def _flatten(config: Dict[str, Any], prefix: str, flat: Dict[str, Any]):
+    """
+    ネストした設定辞書をドット記法のキー → 値の辞書に展開（途中の辞書もそのまま登録）
+
+    Args:
+        config: 展開する設定辞書
+        prefix: キーの接頭辞（"audio_input." など）
+        flat: 展開結果の書き込み先
+    """
+    for key, value in config.items():
+        path = prefix + str(key)
+        flat[path] = value
+        if isinstance(value, dict):
+            _flatten(value, path + '.', flat)
 
 
 class ConfigManager:
@@ -19,14 +85,17 @@ class ConfigManager:
             config_path: 設定ファイルのパス
         """
         self.config_path = config_path
+        self._mtime_ns: Optional[int] = None  # 読み込んだ設定ファイルの更新時刻（ファイルがない場合はNone）
         self._config = self._load_config()
+        self._flat: Optional[Dict[str, Any]] = None  # ドット記法キー → 値（get時に構築、set時に破棄）
+        self._derived: Dict[str, Any] = {}  # 既定値と合成した設定（get_vad_configなど、set時に破棄）
     
     def _load_config(self) -> Dict[str, Any]:
         """設定ファイルを読み込み"""
+        self._mtime_ns = self._stat_mtime_ns()
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+            if self._mtime_ns is not None:
+                config = _load_json(self.config_path)
                 print(f"✅ 設定ファイル読み込み完了: {self.config_path}")
                 return config
             else:
@@ -37,6 +106,27 @@ class ConfigManager:
             print("デフォルト設定を使用します")
             return self._get_default_config()
     
+    def _stat_mtime_ns(self) -> Optional[int]:
+        """設定ファイルの更新時刻（ナノ秒）を取得（ファイルがない場合はNone）"""
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload_if_changed(self) -> bool:
+        """
+        設定ファイルが更新されている場合のみ読み込み直す（未更新ならstat 1回で終わる）
+        
+        Returns:
+            読み込み直したかどうか
+        """
+        if self._stat_mtime_ns() == self._mtime_ns:
+            return False
+        
+        self._config = self._load_config()
+        self._invalidate_caches()
+        return True
+    
     def _get_default_config(self) -> Dict[str, Any]:
         """デフォルト設定を取得"""
         return {
@@ -76,10 +166,18 @@ class ConfigManager:
                 "log_level": "INFO",
                 "startup_message": "音声アシスタント ルクス が起動しました。ルクス と呼びかけてください。",
                 "shutdown_message": "音声アシスタントを終了します。お疲れ様でした。",
-                "ready_message": "はい、何でしょうか？"
+                "ready_message": "はい、何でしょうか？",
+                "thinking_message": "少々お待ちください",
+                "no_response_message": "Geminiからの応答を取得できませんでした",
+                "connection_error_message": "通信エラーが発生しました"
             }
         }
     
+    def _invalidate_caches(self):
+        """設定変更時に、展開済みのキーと既定値を合成した設定のキャッシュを破棄"""
+        self._flat = None
+        self._derived.clear()
+    
     def get(self, key_path: str, default: Any = None) -> Any:
         """
         設定値を取得（ドット記法対応）
@@ -91,11 +189,21 @@ class ConfigManager:
         Returns:
             設定値
         """
+        flat = self._flat
+        if flat is None:
+            flat = {}
+            _flatten(self._config, '', flat)
+            self._flat = flat
+        
+        value = flat.get(key_path, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        # 展開後に辞書へ直接追加されたキー（get_vad_configの既定値補完など）は従来通り辿る
         try:
-            keys = key_path.split('.')
             value = self._config
             
-            for key in keys:
+            for key in _split_key_path(key_path):
                 if isinstance(value, dict) and key in value:
                     value = value[key]
                 else:
@@ -114,7 +222,7 @@ class ConfigManager:
             value: 新しい値
         """
         try:
-            keys = key_path.split('.')
+            keys = _split_key_path(key_path)
             config = self._config
             
             # 最後のキー以外まで辿る
@@ -125,6 +233,7 @@ class ConfigManager:
             
             # 最後のキーに値を設定
             config[keys[-1]] = value
+            self._invalidate_caches()
             
         except Exception as e:
             print(f"設定変更エラー: {e}")
@@ -139,8 +248,8 @@ class ConfigManager:
                 shutil.copy2(self.config_path, backup_path)
             
             # 設定を保存
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, ensure_ascii=False, indent=2)
+            _dump_json(self._config, self.config_path)
+            self._mtime_ns = self._stat_mtime_ns()
             
             print(f"✅ 設定ファイル保存完了: {self.config_path}")
             return True
@@ -160,6 +269,8 @@ class ConfigManager:
     @property
     def config(self) -> Dict[str, Any]:
         """設定辞書への直接アクセス（最適化機能用）"""
+        # 呼び出し側で書き換えられる可能性があるため、展開済みのキャッシュは破棄する
+        self._invalidate_caches()
         return self._config
 
     def get_audio_input_config(self) -> Dict[str, Any]:
@@ -187,11 +298,31 @@ class ConfigManager:
         return self.get("exit_commands", ["終了"])
     
     def get_system_messages(self) -> Dict[str, str]:
-        """システムメッセージを取得"""
-        return self.get("system", {})
+        """
+        システムメッセージを取得（未設定のメッセージはデフォルト値で補完）
+        
+        Returns:
+            キーが *_message のメッセージ辞書
+        """
+        messages = self._derived.get("system_messages")
+        if messages is not None:
+            return messages
+        
+        defaults = self._get_default_config()["system"]
+        system = {**defaults, **self.get("system", {})}
+        messages = {
+            key: value for key, value in system.items()
+            if key.endswith("_message") and isinstance(value, str)
+        }
+        self._derived["system_messages"] = messages
+        return messages
     
     def get_vad_config(self) -> dict:
         """VAD（音声活動検出）設定を取得"""
+        vad_config = self._derived.get("vad")
+        if vad_config is not None:
+            return vad_config
+        
         vad_config = self._config.get("audio_input", {}).get("vad_settings", {})
         
         # デフォルト値
@@ -208,6 +339,7 @@ class ConfigManager:
             if key not in vad_config:
                 vad_config[key] = default_value
         
+        self._derived["vad"] = vad_config
         return vad_config
     
     def print_config(self):
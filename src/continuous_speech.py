@@ -5,9 +5,11 @@
 """
 
 import threading
-import queue
 import time
 import datetime
+import os
+import sys
+import traceback
 import numpy as np
 import pyaudio
 import speech_recognition as sr
@@ -15,6 +17,13 @@ from typing import Optional, Callable, Tuple
 import webrtcvad
 import collections
 
+try:
+    from .keyword_matcher import KeywordMatcher
+    from .dsp_kernels import frame_energy
+except ImportError:
+    from keyword_matcher import KeywordMatcher
+    from dsp_kernels import frame_energy
+
 # 音韻的類似度検証モジュールをインポート
 try:
     from phonetic_similarity import EnhancedWakeWordVerifier
@@ -28,6 +37,50 @@ except ImportError:
         PHONETIC_VERIFICATION_AVAILABLE = False
 
 
+# 監視スレッドの優先度（Windows: THREAD_PRIORITY_HIGHEST / Linux: nice値）
+THREAD_PRIORITY_HIGHEST = 2
+MONITOR_THREAD_NICE = -5
+
+
+def raise_current_thread_priority() -> bool:
+    """
+    呼び出し元スレッドの優先度を上げる（負荷時の音声フレーム取りこぼし防止）
+    
+    Linuxでnice値を下げるにはCAP_SYS_NICEが必要なため、失敗しても例外は投げない
+    
+    Returns:
+        優先度を変更できたかどうか
+    """
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            return bool(kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_HIGHEST))
+        if hasattr(os, 'setpriority'):
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), MONITOR_THREAD_NICE)
+            return True
+    except (OSError, AttributeError):
+        pass
+    return False
+
+
+# ウェイクワードの曖昧一致パターン（誤認識されやすい表記 → ウェイクワード）
+FUZZY_WAKE_WORDS = {
+    "ラックス": "ルクス", "らっくす": "ルクス",
+    "ルックス": "ルクス", "るっくす": "ルクス",
+    "ルークス": "ルクス", "るーくす": "ルクス",  # 長音変化を追加
+    "リクス": "ルクス", "りくす": "ルクス",      # 母音変化を追加
+    "ラクス": "ルクス", "らくす": "ルクス",      # よくある誤認識
+    # 特殊な誤認識パターン
+    "ございます": "ルクス",   # 重要：敬語への誤変換対策
+    "おはようございます": "おはようルクス",
+    "こんにちは": "ルクス",   # 挨拶の誤認識対策
+    "ありがとうございます": "ルクス",  # 敬語誤認識対策
+    # 英語パターン拡張
+    "luck": "Lux", "lacks": "Lux", "lux": "Lux"
+}
+
+
 class ContinuousSpeechMonitor:
     """常時音声監視クラス"""
     
@@ -42,6 +95,9 @@ class ContinuousSpeechMonitor:
         """
         self.language = language
         self.wake_words = wake_words or ["ルクス", "るくす", "Lux", "lux"]
+        # ウェイクワード・曖昧一致パターンを事前コンパイル（1回の走査で照合）
+        self.wake_word_matcher = KeywordMatcher(self.wake_words)
+        self.fuzzy_matcher = KeywordMatcher(FUZZY_WAKE_WORDS)
         self.audio_handler = audio_handler  # 音声出力ハンドラー
         
         # 音声設定
@@ -74,6 +130,8 @@ class ContinuousSpeechMonitor:
         # VAD (Voice Activity Detection) 初期化
         self.vad = webrtcvad.Vad(2)  # 感度: 0(低) - 3(高)
         self.volume_threshold = 500  # フォールバック用音量閾値
+        self.gate_threshold = 150  # VAD前段の音量ゲート（RMS、これ未満はVADを呼ばず無音扱い）
+        self.gated_chunks = 0  # 音量ゲートで除外したチャンク数
         
         # バッファ管理
         self.audio_buffer = collections.deque(maxlen=100)  # 約3秒分
@@ -82,6 +140,11 @@ class ContinuousSpeechMonitor:
         self.voice_start_time = None
         self.silence_duration = 0
         
+        # 発話終了判定（短い発話＝ウェイクワード単体と見なし、早めに認識へ回す）
+        self.end_silence_ms = 500             # 通常の発話終了判定の無音長
+        self.short_utterance_ms = 1500        # これより短い発話は短縮判定を使用
+        self.short_utterance_silence_ms = 300 # 短い発話の発話終了判定の無音長
+        
         # 制御フラグ
         self.is_running = False
         self.is_processing = False  # 処理中フラグを追加
@@ -89,8 +152,13 @@ class ContinuousSpeechMonitor:
         self.monitoring_thread = None
         self.processing_thread = None
         
-        # キューとコールバック
-        self.audio_queue = queue.Queue()
+        # 受信チャンクの受け渡し（PyAudioコールバック → 監視スレッドの1対1）
+        # deque.append/popleftはロックなしでスレッド安全なため、コールバック側ではロックを取らない
+        self.audio_chunks = collections.deque(maxlen=int(10 * 1000 / self.chunk_duration_ms))  # 約10秒分
+        self._chunk_ready = threading.Event()
+        self._consumer_waiting = False  # 監視スレッドが待機中の場合のみコールバックから通知する
+        
+        # コールバック
         self.wake_word_callback = None
         self.command_callback = None
         
@@ -106,7 +174,7 @@ class ContinuousSpeechMonitor:
         self.last_wake_word_text = ""
         self.last_wake_word_time = 0
         self.wake_word_cooldown = 3.0  # 秒単位のクールダウン時間
-        self.audio_output_end_time = 0  # 音声出力終了時刻
+        self.audio_output_end_time = 0  # 音声出力終了時刻（time.monotonic()基準）
         self.audio_output_suppression_time = 2.0  # 音声出力後の検知抑制時間
         
         print("常時音声監視システム初期化完了")
@@ -189,18 +257,48 @@ class ContinuousSpeechMonitor:
         """
         PyAudio コールバック - 音声データの受信
         """
+        self.audio_chunks.append(in_data)
+        if self._consumer_waiting:
+            self._chunk_ready.set()
+        return (None, pyaudio.paContinue)
+    
+    def _next_chunk(self, timeout: float) -> Optional[bytes]:
+        """
+        受信済みチャンクを1つ取得（なければ到着まで待機）
+        
+        Args:
+            timeout: 最大待機時間（秒）
+            
+        Returns:
+            音声データ。タイムアウトした場合はNone
+        """
         try:
-            self.audio_queue.put(in_data)
-        except:
+            return self.audio_chunks.popleft()
+        except IndexError:
             pass
-        return (None, pyaudio.paContinue)
+        
+        # 待機中であることを先に公開してから再確認する（通知の取りこぼし防止）
+        self._consumer_waiting = True
+        self._chunk_ready.clear()
+        try:
+            if not self.audio_chunks:
+                self._chunk_ready.wait(timeout)
+            return self.audio_chunks.popleft()
+        except IndexError:
+            return None
+        finally:
+            self._consumer_waiting = False
     
     def _monitor_loop(self):
         """音声監視メインループ"""
+        raise_current_thread_priority()
+        
         while self.is_running:
             try:
                 # 音声データ取得（タイムアウト付き）
-                audio_data = self.audio_queue.get(timeout=0.1)
+                audio_data = self._next_chunk(timeout=0.1)
+                if audio_data is None:
+                    continue
                 
                 # 音声データをNumPy配列に変換
                 audio_np = np.frombuffer(audio_data, dtype=np.int16)
@@ -214,7 +312,7 @@ class ContinuousSpeechMonitor:
                     continue
                 
                 # 音声出力後の検知抑制時間チェック
-                current_time = time.time()
+                current_time = time.monotonic()
                 if current_time - self.audio_output_end_time < self.audio_output_suppression_time:
                     continue
                 
@@ -222,7 +320,7 @@ class ContinuousSpeechMonitor:
                     if not self.is_voice_active:
                         # 音声開始
                         self.is_voice_active = True
-                        self.voice_start_time = time.time()
+                        self.voice_start_time = time.monotonic()
                         self.voice_buffer = list(self.audio_buffer)  # 過去のバッファも含める
                         print("🎤 音声検知")
                     else:
@@ -235,18 +333,31 @@ class ContinuousSpeechMonitor:
                         self.silence_duration += self.chunk_duration_ms
                         self.voice_buffer.append(audio_np)
                         
-                        # 音声終了判定（500ms以上の無音）
-                        if self.silence_duration >= 500:
+                        # 音声終了判定（短い発話ほど早く確定させる）
+                        if self.silence_duration >= self._end_silence_threshold_ms():
                             self._process_voice_segment()
                             self.is_voice_active = False
                             self.voice_buffer = []
                             self.silence_duration = 0
                 
-            except queue.Empty:
-                continue
             except Exception as e:
                 print(f"音声監視エラー: {e}")
     
+    def _end_silence_threshold_ms(self) -> int:
+        """
+        現在の発話に対する発話終了判定の無音長を取得
+        
+        「ルクス」のみの短い発話は無音300msで確定させ、ウェイクワード検知までの待ちを短縮する
+        
+        Returns:
+            発話終了と判定する無音長（ミリ秒）
+        """
+        # voice_bufferは検知前のバッファも含むため、発話開始時刻から経過時間を求める
+        voiced_ms = (time.monotonic() - self.voice_start_time) * 1000 - self.silence_duration
+        if voiced_ms < self.short_utterance_ms:
+            return self.short_utterance_silence_ms
+        return self.end_silence_ms
+    
     def _process_loop(self):
         """音声処理ループ（別スレッド）"""
         # このスレッドは将来的にバックグラウンド処理用
@@ -263,14 +374,20 @@ class ContinuousSpeechMonitor:
         Returns:
             音声が検知されたかどうか
         """
+        # 背景の無音はVAD（と後段の音声認識）に回さず、音量だけで除外する
+        # RMSの平方根は取らず、二乗和を「閾値の二乗×サンプル数」と比較する
+        samples = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
+        energy = float(np.dot(samples, samples))
+        if len(samples) == 0 or energy < self.gate_threshold * self.gate_threshold * len(samples):
+            self.gated_chunks += 1
+            return False
+        
         try:
             # VADは10ms, 20ms, 30msのチャンクサイズをサポート
             return self.vad.is_speech(audio_data, self.sample_rate)
         except:
             # VADエラー時は音量で判定
-            audio_np = np.frombuffer(audio_data, dtype=np.int16)
-            volume = np.sqrt(np.mean(audio_np**2))
-            return volume > self.volume_threshold
+            return energy > self.volume_threshold * self.volume_threshold * len(samples)
     
     def _process_voice_segment(self):
         """音声セグメントの処理"""
@@ -290,6 +407,12 @@ class ContinuousSpeechMonitor:
             if text:
                 print(f"🎯 音声認識: '{text}'")
                 
+                # 応答再生中は自分の音声の回り込みを除外（バージイン時の誤検知防止）
+                if self.audio_handler and hasattr(self.audio_handler, 'is_playback_echo'):
+                    if self.audio_handler.is_playback_echo(text):
+                        print(f"🔁 再生中の音声のエコーを無視: '{text}'")
+                        return
+                
                 # ウェイクワード検知
                 is_wake_word, extracted_command = self._check_wake_word(text)
                 
@@ -312,7 +435,6 @@ class ContinuousSpeechMonitor:
                     print(f"📝 通常音声: '{text}'")
         
         except Exception as e:
-            import traceback
             print(f"音声セグメント処理エラー: {e}")
             print(f"詳細エラー情報: {traceback.format_exc()}")
         finally:
@@ -365,7 +487,7 @@ class ContinuousSpeechMonitor:
                 return False, ""
             
             # 重複検知防止チェック
-            current_time = time.time()
+            current_time = time.monotonic()
             if (text == self.last_wake_word_text and 
                 current_time - self.last_wake_word_time < self.wake_word_cooldown):
                 print(f"🔄 重複ウェイクワードを無視: '{text}' (クールダウン: {self.wake_word_cooldown}秒)")
@@ -408,7 +530,6 @@ class ContinuousSpeechMonitor:
             return False, ""
             
         except Exception as e:
-            import traceback
             print(f"ウェイクワードチェックエラー: {e}")
             print(f"詳細エラー情報: {traceback.format_exc()}")
             return False, ""
@@ -446,37 +567,17 @@ class ContinuousSpeechMonitor:
                 return True, ""
         
         # ウェイクワード検知
-        for wake_word in self.wake_words:
-            wake_word_lower = wake_word.lower()
-            if wake_word_lower in text_lower:
-                # コマンド抽出
-                wake_word_index = text_lower.find(wake_word_lower)
-                command = text[wake_word_index + len(wake_word):].strip()
-                command = command.lstrip('、。，,')
-                return True, command
-        
-        # 曖昧一致チェック
-        fuzzy_matches = {
-            "ラックス": "ルクス", "らっくす": "ルクス",  
-            "ルックス": "ルクス", "るっくす": "ルクス",
-            "ルークス": "ルクス", "るーくす": "ルクス",  # 長音変化を追加
-            "リクス": "ルクス", "りくす": "ルクス",      # 母音変化を追加
-            "ラクス": "ルクス", "らくす": "ルクス",      # よくある誤認識
-            # 特殊な誤認識パターン
-            "ございます": "ルクス",   # 重要：敬語への誤変換対策
-            "おはようございます": "おはようルクス",
-            "こんにちは": "ルクス",   # 挨拶の誤認識対策
-            "ありがとうございます": "ルクス",  # 敬語誤認識対策
-            # 英語パターン拡張
-            "luck": "Lux", "lacks": "Lux", "lux": "Lux"  
-        }
-        
-        for fuzzy_word, wake_word in fuzzy_matches.items():
-            if fuzzy_word.lower() in text_lower:
-                fuzzy_index = text_lower.find(fuzzy_word.lower())
-                command = text[fuzzy_index + len(fuzzy_word):].strip()
-                command = command.lstrip('、。，,')
-                return True, command
+        match = self.wake_word_matcher.find_first(text, text_lower)
+        if match is None:
+            # 曖昧一致チェック
+            match = self.fuzzy_matcher.find_first(text, text_lower)
+        
+        if match is not None:
+            # コマンド抽出
+            _, match_end, _ = match
+            command = text[match_end:].strip()
+            command = command.lstrip('、。，,')
+            return True, command
         
         return False, ""
     
@@ -520,14 +621,11 @@ class ContinuousSpeechMonitor:
         # 実際の実装では音声バッファの分析等を行う
         # ここでは簡易的な値を返す
         if len(self.audio_buffer) > 10:
-            # 音声バッファの音量変動からノイズレベルを推定
-            volumes = []
-            for audio_chunk in list(self.audio_buffer)[-10:]:
-                if isinstance(audio_chunk, np.ndarray):
-                    volume = np.sqrt(np.mean(audio_chunk.astype(np.float32) ** 2))
-                    volumes.append(volume)
+            # 音声バッファの音量変動からノイズレベルを推定（直近10チャンクのRMSを一括計算）
+            recent = [chunk for chunk in list(self.audio_buffer)[-10:] if isinstance(chunk, np.ndarray)]
+            volumes = frame_energy(np.concatenate(recent), self.chunk_size, self.chunk_size) if recent else []
             
-            if volumes:
+            if len(volumes) > 0:
                 # 音量の標準偏差が大きいほどノイズが多いと推定
                 std_volume = np.std(volumes)
                 return min(1.0, std_volume / 1000.0)
@@ -542,6 +640,7 @@ class ContinuousSpeechMonitor:
             統計情報辞書
         """
         stats = self.detection_stats.copy()
+        stats['gated_chunks'] = self.gated_chunks
         
         if self.use_phonetic_verification and self.phonetic_verifier:
             phonetic_stats = self.phonetic_verifier.get_verification_statistics()
@@ -569,7 +668,7 @@ class ContinuousSpeechMonitor:
             print("🔇 音声出力中のため音声検知を一時停止")
         else:
             # 音声出力終了時刻を記録
-            self.audio_output_end_time = time.time()
+            self.audio_output_end_time = time.monotonic()
             print(f"🎤 音声検知を再開 (抑制時間: {self.audio_output_suppression_time}秒)")
     
     def enable_phonetic_verification(self, enable: bool = True):
@@ -0,0 +1,267 @@
+"""
+音声信号処理カーネル
+無音判定などサンプル単位の計算をNumPyベクトル演算（Numba利用時はJIT）で行う
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Numba JIT（オプション、未インストール時はNumPy実装を使用）
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# JITコンパイル済みか（warmup_kernelsの完了まではNumPy実装を使い、呼び出し側でコンパイル待ちを起こさない）
+_jit_ready = False
+
+
+def _voiced_bounds_numpy(samples: np.ndarray, window: int, threshold: float) -> Tuple[int, int]:
+    """find_voiced_boundsのNumPy実装（移動窓の二乗和を累積和の差分で計算）"""
+    if len(samples) < window:
+        return -1, -1
+
+    cumulative = np.concatenate(([0.0], np.cumsum(samples.astype(np.float64) ** 2)))
+    energy = cumulative[window:] - cumulative[:-window]
+    voiced = np.flatnonzero(energy > threshold * threshold * window)
+    if len(voiced) == 0:
+        return -1, -1
+    return int(voiced[0]), int(voiced[-1]) + window
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _voiced_bounds_jit(samples, window, threshold):
+        """find_voiced_boundsのNumba実装（前後から1パスずつ走査）"""
+        n = samples.shape[0]
+        if n < window:
+            return -1, -1
+        limit = threshold * threshold * window
+
+        # 先頭側：移動窓の二乗和が閾値を超える最初の窓
+        start = -1
+        acc = 0.0
+        for i in range(n):
+            value = float(samples[i])
+            acc += value * value
+            if i >= window:
+                old = float(samples[i - window])
+                acc -= old * old
+            if i >= window - 1 and acc > limit:
+                start = i - window + 1
+                break
+        if start < 0:
+            return -1, -1
+
+        # 末尾側：移動窓の二乗和が閾値を超える最後の窓
+        end = n
+        acc = 0.0
+        for j in range(n - 1, -1, -1):
+            value = float(samples[j])
+            acc += value * value
+            if j + window < n:
+                old = float(samples[j + window])
+                acc -= old * old
+            if j + window <= n and acc > limit:
+                end = j + window
+                break
+        return start, end
+
+
+def _frame_energy_numpy(buf: np.ndarray, frame_len: int, hop: int) -> np.ndarray:
+    """frame_energyのNumPy実装"""
+    if len(buf) < frame_len:
+        return np.zeros(0, dtype=np.float32)
+
+    frames = np.lib.stride_tricks.sliding_window_view(buf, frame_len)[::hop]
+    squared = frames.astype(np.float32) ** 2
+    return np.sqrt(squared.mean(axis=1)).astype(np.float32)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _frame_energy_jit(buf, frame_len, hop):
+        """frame_energyのNumba実装"""
+        n = buf.shape[0]
+        if n < frame_len:
+            return np.zeros(0, dtype=np.float32)
+
+        n_frames = (n - frame_len) // hop + 1
+        result = np.empty(n_frames, dtype=np.float32)
+        for f in range(n_frames):
+            offset = f * hop
+            acc = np.float32(0.0)
+            for i in range(offset, offset + frame_len):
+                value = np.float32(buf[i])
+                acc += value * value
+            result[f] = np.sqrt(acc / frame_len)
+        return result
+
+
+def frame_energy(buf: np.ndarray, frame_len: int, hop: int) -> np.ndarray:
+    """
+    フレームごとのRMS（音量）を計算
+
+    int16のまま二乗すると桁あふれするため、float32で累積する
+
+    Args:
+        buf: PCMサンプル（1次元配列）
+        frame_len: フレーム長（サンプル数）
+        hop: フレームの移動幅（サンプル数）
+
+    Returns:
+        各フレームのRMS（float32配列）。バッファがフレーム長未満の場合は空配列
+    """
+    frame_len = max(1, int(frame_len))
+    hop = max(1, int(hop))
+    if _jit_ready:
+        return _frame_energy_jit(np.ascontiguousarray(buf), frame_len, hop)
+    return _frame_energy_numpy(buf, frame_len, hop)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _pcm16_with_rms_jit(samples, out):
+        """pcm16_with_rmsのNumba実装（二乗和の累積とint16変換を1ループで行う）"""
+        n = samples.shape[0]
+        if n == 0:
+            return 0.0
+        acc = 0.0
+        for i in range(n):
+            value = float(samples[i])
+            acc += value * value
+            if value > 1.0:
+                value = 1.0
+            elif value < -1.0:
+                value = -1.0
+            out[i] = np.int16(value * 32767)
+        return np.sqrt(acc / n)
+
+
+def pcm16_with_rms(samples: np.ndarray, out: np.ndarray) -> float:
+    """
+    float32サンプルをint16 PCMへ変換し、同じ走査でRMS（音量）を計算
+
+    録音ブロックごとの無音判定とWebRTC VAD用の変換を、バッファの1回の読み出しで済ませる
+
+    Args:
+        samples: float32サンプル（1次元、-1.0〜1.0）
+        out: 変換結果の書き込み先（int16、samples以上の長さ）
+
+    Returns:
+        変換前サンプルのRMS。空の場合は0.0
+    """
+    samples = np.ascontiguousarray(samples)
+    if _jit_ready:
+        return float(_pcm16_with_rms_jit(samples, out))
+    n = len(samples)
+    if n == 0:
+        return 0.0
+    np.multiply(np.clip(samples, -1.0, 1.0), 32767, out=out[:n], casting='unsafe')
+    return float(np.sqrt(np.dot(samples, samples) / n))
+
+
+def _has_silent_run_numpy(samples: np.ndarray, frame_len: int, threshold: float, min_frames: int) -> bool:
+    """has_silent_runのNumPy実装（フレームの二乗平均を一括計算し、無音フレームの連続長を求める）"""
+    usable = len(samples) - len(samples) % frame_len
+    frames = samples[:usable].astype(np.float32).reshape(-1, frame_len)
+    mean_squares = np.einsum('ij,ij->i', frames, frames) / frame_len
+    if usable < len(samples):
+        tail = samples[usable:].astype(np.float32)
+        mean_squares = np.append(mean_squares, np.dot(tail, tail) / len(tail))
+
+    # 平方根は取らず、閾値の二乗と比較する
+    silent = np.concatenate(([0], (mean_squares < threshold * threshold).view(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(silent))
+    runs = edges[1::2] - edges[::2]
+    return bool(len(runs)) and int(runs.max()) >= min_frames
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _has_silent_run_jit(samples, frame_len, threshold, min_frames):
+        """has_silent_runのNumba実装（フレームごとの二乗和を閾値と比較し、見つかった時点で終了）"""
+        n = samples.shape[0]
+        limit = threshold * threshold
+        consecutive = 0
+        for offset in range(0, n, frame_len):
+            end = min(offset + frame_len, n)
+            acc = 0.0
+            for i in range(offset, end):
+                value = float(samples[i])
+                acc += value * value
+            if acc < limit * (end - offset):
+                consecutive += 1
+                if consecutive >= min_frames:
+                    return True
+            else:
+                consecutive = 0
+        return False
+
+
+def has_silent_run(samples: np.ndarray, frame_len: int, threshold: float, min_frames: int) -> bool:
+    """
+    RMSが閾値未満のフレームが指定数以上連続する区間があるか
+
+    末尾のフレーム長に満たない部分も1フレームとして扱う
+
+    Args:
+        samples: PCMサンプル（1次元配列）
+        frame_len: フレーム長（サンプル数）
+        threshold: RMS閾値（入力と同じスケール）
+        min_frames: 無音と判定する連続フレーム数
+
+    Returns:
+        無音区間があればTrue
+    """
+    frame_len = max(1, int(frame_len))
+    min_frames = max(1, int(min_frames))
+    if len(samples) == 0:
+        return False
+    if _jit_ready:
+        return bool(_has_silent_run_jit(np.ascontiguousarray(samples), frame_len, float(threshold), min_frames))
+    return _has_silent_run_numpy(samples, frame_len, float(threshold), min_frames)
+
+
+def warmup_kernels():
+    """
+    JITコンパイルを済ませ、以降の呼び出しでJIT実装を使うよう切り替える
+
+    バックグラウンドのウォームアップスレッドから呼び出す。完了前の呼び出しはNumPy実装で処理される
+    """
+    global _jit_ready
+
+    if not NUMBA_AVAILABLE or _jit_ready:
+        return
+    dummy = np.zeros(2, dtype=np.int16)
+    samples = np.zeros(2, dtype=np.float32)
+    _frame_energy_jit(dummy, 1, 1)
+    _pcm16_with_rms_jit(samples, np.zeros(2, dtype=np.int16))
+    _voiced_bounds_jit(dummy, 1, 1.0)
+    _has_silent_run_jit(samples, 1, 1.0, 1)
+    _jit_ready = True
+
+
+def find_voiced_bounds(samples: np.ndarray, window: int, threshold: float) -> Optional[Tuple[int, int]]:
+    """
+    移動窓RMSが閾値を超える区間の範囲を取得（無音トリミング用）
+
+    Args:
+        samples: モノラルPCMサンプル（1次元配列）
+        window: RMSの窓幅（サンプル数）
+        threshold: RMS閾値（int16振幅）
+
+    Returns:
+        (開始サンプル位置, 終了サンプル位置)。有音区間がない場合はNone
+    """
+    window = max(1, int(window))
+    if _jit_ready:
+        start, end = _voiced_bounds_jit(np.ascontiguousarray(samples), window, float(threshold))
+    else:
+        start, end = _voiced_bounds_numpy(samples, window, float(threshold))
+
+    if start < 0:
+        return None
+    return start, end
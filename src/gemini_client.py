@@ -4,9 +4,15 @@ Gemini CLI連携モジュール
 """
 
 import subprocess
+import shutil
 import json
+import codecs
+import threading
 import logging
-from typing import Optional, Dict, Any
+import os
+import re
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple, Iterator
 
 
 class GeminiClient:
@@ -17,7 +23,8 @@ class GeminiClient:
                  timeout: int = 30,
                  optimized_timeout: int = 15,
                  enable_optimization: bool = True,
-                 model: str = "gemini-2.5-flash"):
+                 model: str = "gemini-2.5-flash",
+                 check_cli: bool = True):
         """
         初期化
         
@@ -27,6 +34,7 @@ class GeminiClient:
             optimized_timeout: 最適化応答のタイムアウト（秒）
             enable_optimization: 最適化機能を有効にするか
             model: 使用するGeminiモデル
+            check_cli: 初期化時にCLIの動作確認を行うか（Falseの場合はwarmup()で後から実行）
         """
         self.debug = debug
         self.timeout = timeout
@@ -37,18 +45,42 @@ class GeminiClient:
         # ログ設定
         self.logger = logging.getLogger(__name__)
         
+        # 動作確認済みのCLI（実行ファイル, shell使用有無）。毎回のPATH検索・フォールバック起動を省く
+        self.cli_command: Optional[Tuple[str, bool]] = None
+        # cli_commandの直後に付ける引数（nodeで直接起動する場合のスクリプトパス）
+        self.cli_args_prefix: List[str] = []
+        
+        # ストリーミング中のCLIプロセス（終了時に停止する）
+        self._active_processes = set()
+        self._process_lock = threading.Lock()
+        
         opt_status = "有効" if enable_optimization else "無効"
         print(f"Gemini CLI初期化完了: モデル={self.model}, デバッグ={debug}, タイムアウト={timeout}秒, 最適化={opt_status}")
         
         # Gemini CLIの動作確認
-        self._check_gemini_cli()
+        if check_cli:
+            self._check_gemini_cli()
+    
+    def warmup(self) -> bool:
+        """
+        Gemini CLIの事前起動（実行ファイルの解決とディスクキャッシュの温め）
+        
+        起動案内の再生中などにバックグラウンドで呼び出し、初回問い合わせの待ち時間を減らす
+        
+        Returns:
+            CLIが利用可能かどうか
+        """
+        if self.cli_command:
+            return True
+        return self._check_gemini_cli()
     
     def _check_gemini_cli(self) -> bool:
         """Gemini CLIが利用可能かチェック"""
         try:
-            # Windows環境では.cmdファイルを直接指定
+            # Windows環境では.cmdファイルを直接指定（フルパスを解決しておく）
+            cmd_path = shutil.which('gemini.cmd') or 'gemini.cmd'
             result = subprocess.run(
-                ['gemini.cmd', '--help'], 
+                [cmd_path, '--help'], 
                 capture_output=True, 
                 text=True, 
                 encoding='utf-8',
@@ -57,6 +89,8 @@ class GeminiClient:
                 shell=False
             )
             if result.returncode == 0:
+                self.cli_command = (cmd_path, False)
+                self._resolve_node_entry(cmd_path)
                 print(f"✅ Gemini CLI確認: 動作確認完了")
                 return True
             else:
@@ -71,6 +105,7 @@ class GeminiClient:
                     shell=True
                 )
                 if result2.returncode == 0:
+                    self.cli_command = ('gemini', True)
                     print(f"✅ Gemini CLI確認: 動作確認完了")
                     return True
                 else:
@@ -93,6 +128,81 @@ class GeminiClient:
             print("   手動で 'gemini --help' を実行して動作を確認してください")
             return False
     
+    def _resolve_node_entry(self, cmd_path: str) -> bool:
+        """
+        npmのgemini.cmdラッパーからnodeとエントリスクリプトを解決し、直接起動するよう設定
+        
+        cmd.exe経由の起動を省くことで毎回のプロセス起動が1段減り、
+        プロンプト中の & や " がcmd.exeに解釈されることもなくなる
+        
+        Args:
+            cmd_path: gemini.cmdのパス
+            
+        Returns:
+            直接起動に切り替えた場合True（解決できない場合は.cmdのまま）
+        """
+        if not os.path.isfile(cmd_path):
+            return False
+        
+        # ラッパーと同じく、同梱のnode.exeがあればそれを優先
+        cmd_dir = os.path.dirname(os.path.abspath(cmd_path))
+        bundled_node = os.path.join(cmd_dir, 'node.exe')
+        node_path = bundled_node if os.path.isfile(bundled_node) else shutil.which('node')
+        if not node_path:
+            return False
+        
+        try:
+            with open(cmd_path, 'r', encoding='utf-8', errors='ignore') as f:
+                match = re.search(r'"%dp0%\\([^"]+\.js)"', f.read())
+        except OSError:
+            return False
+        
+        if not match:
+            return False
+        
+        script = os.path.join(cmd_dir, match.group(1))
+        if not os.path.isfile(script):
+            return False
+        
+        self.cli_command = (node_path, False)
+        self.cli_args_prefix = [script]
+        return True
+    
+    def _run_cli(self, args: List[str], timeout: int) -> subprocess.CompletedProcess:
+        """
+        Gemini CLIを実行（確認済みのCLIがあればそれのみ、なければ.cmd → gemini の順に試行）
+        
+        Args:
+            args: CLIに渡す引数
+            timeout: タイムアウト（秒）
+            
+        Returns:
+            最後に実行したプロセスの結果
+        """
+        if self.cli_command:
+            candidates = [self.cli_command]
+            prefix = self.cli_args_prefix
+        else:
+            candidates = [('gemini.cmd', False), ('gemini', True)]
+            prefix = []
+        
+        result = None
+        for executable, use_shell in candidates:
+            result = subprocess.run(
+                [executable] + prefix + args,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='ignore',  # エンコーディングエラーを無視
+                timeout=timeout,
+                shell=use_shell
+            )
+            if result.returncode == 0:
+                self.cli_command = (executable, use_shell)
+                break
+        
+        return result
+    
     def create_assistant_prompt(self, user_input: str) -> str:
         """
         音声アシスタント用のプロンプトを作成（現在はシステムプロンプトなし）
@@ -124,57 +234,29 @@ class GeminiClient:
             else:
                 formatted_prompt = prompt
             
-            # コマンドを構築（Windows環境を考慮）
-            cmd = ['gemini.cmd', '-m', self.model, '-p', formatted_prompt]
+            # コマンド引数を構築
+            args = ['-m', self.model, '-p', formatted_prompt]
             
             # デバッグモード
             if self.debug:
-                cmd.append('-d')
+                args.append('-d')
             
             print(f"📤 Geminiに送信中: '{prompt}'")
             if self.debug:
-                print(f"デバッグ: コマンド = {' '.join(cmd)}")
+                print(f"デバッグ: 引数 = {' '.join(args)}")
             
             # Gemini CLI実行
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore',  # エンコーディングエラーを無視
-                timeout=self.timeout,
-                shell=False
-            )
+            result = self._run_cli(args, self.timeout)
             
             if result.returncode == 0:
                 response = result.stdout.strip()
                 print(f"📥 Gemini応答取得成功")
                 return response
             else:
-                # .cmdが失敗した場合、通常のgeminiを試す
-                cmd_fallback = ['gemini', '-m', self.model, '-p', formatted_prompt]
-                if self.debug:
-                    cmd_fallback.append('-d')
-                
-                result_fallback = subprocess.run(
-                    cmd_fallback,
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    errors='ignore',  # エンコーディングエラーを無視
-                    timeout=self.timeout,
-                    shell=True
-                )
-                
-                if result_fallback.returncode == 0:
-                    response = result_fallback.stdout.strip()
-                    print(f"📥 Gemini応答取得成功 (fallback)")
-                    return response
-                else:
-                    error_msg = result.stderr.strip() or result_fallback.stderr.strip()
-                    print(f"❌ Gemini CLIエラー: {error_msg}")
-                    self.logger.error(f"Gemini CLI error: {error_msg}")
-                    return None
+                error_msg = result.stderr.strip()
+                print(f"❌ Gemini CLIエラー: {error_msg}")
+                self.logger.error(f"Gemini CLI error: {error_msg}")
+                return None
                 
         except subprocess.TimeoutExpired:
             print(f"⏰ Gemini CLI応答がタイムアウトしました（{self.timeout}秒）")
@@ -214,21 +296,179 @@ class GeminiClient:
         if not self.enable_optimization:
             return self.send_command(command)
         
-        # 簡単なコマンドかどうかを判定
+        if self._is_simple_command(command):
+            # 簡単なコマンドは最適化版を使用
+            return self.send_prompt_optimized(command, max_tokens=100)
+        else:
+            # 複雑なコマンドは通常版を使用
+            return self.send_command(command)
+
+    def _is_simple_command(self, command: str) -> bool:
+        """
+        短い応答で済む簡単なコマンドかどうかを判定
+        
+        Args:
+            command: ユーザーからのコマンド
+            
+        Returns:
+            簡単なコマンドの場合True
+        """
         simple_commands = [
             '電気', '照明', 'ライト', '温度', '時間', '天気', 
             'つけて', '消して', '教えて', 'どう', 'なに', 'いくつ'
         ]
+        return any(word in command for word in simple_commands)
+    
+    def stream_command(self, command: str) -> Iterator[str]:
+        """
+        コマンドをGeminiに送信し、応答を出力された順に逐次返す（ストリーミング読み上げ用）
         
-        is_simple = any(word in command for word in simple_commands)
+        send_command_fastと同じプロンプトで送信するが、プロセス終了を待たずに
+        標準出力に届いたテキストをその都度返す
         
-        if is_simple:
-            # 簡単なコマンドは最適化版を使用
-            return self.send_prompt_optimized(command, max_tokens=100)
+        Args:
+            command: ユーザーからのコマンド
+            
+        Yields:
+            応答テキストの断片（失敗時は何も返さない）
+        """
+        if self.enable_optimization and self._is_simple_command(command):
+            prompt = f"{command}\n（簡潔に答えてください。50文字以内で。）"
+            timeout = self.optimized_timeout
         else:
-            # 複雑なコマンドは通常版を使用
-            return self.send_command(command)
-
+            prompt = self.create_assistant_prompt(command)
+            timeout = self.timeout
+        
+        args = ['-m', self.model, '-p', prompt]
+        if self.debug:
+            args.append('-d')
+        
+        # 確認済みのCLIがあればそれのみ、なければ.cmd → シェル経由のgemini の順に試行
+        if self.cli_command:
+            candidates = [self.cli_command]
+            prefix = self.cli_args_prefix
+        else:
+            candidates = [(shutil.which('gemini.cmd') or 'gemini.cmd', False), ('gemini', True)]
+            prefix = []
+        
+        print(f"📤 Geminiに送信中(ストリーミング): '{command}'")
+        
+        status, error_msg = "missing", ""
+        for index, (executable, use_shell) in enumerate(candidates):
+            status, produced, error_msg = yield from self._stream_cli(
+                [executable] + prefix + args, use_shell, timeout
+            )
+            if status == "ok":
+                if not self.cli_command:
+                    self.cli_command = (executable, use_shell)
+                print(f"📥 Gemini応答取得成功")
+                return
+            # 何も出力せずに失敗した場合のみ次の候補を試す（出力済みの応答を重複させない）
+            if produced or status == "timeout" or index == len(candidates) - 1:
+                break
+        
+        if status == "missing":
+            print("❌ Gemini CLIが見つかりません")
+            print("   PowerShellで 'gemini --help' を実行して確認してください")
+        elif status == "timeout":
+            print(f"⏰ Gemini CLI応答がタイムアウトしました（{timeout}秒）")
+        else:
+            print(f"❌ Gemini CLIエラー: {error_msg}")
+            self.logger.error(f"Gemini CLI error: {error_msg}")
+    
+    def _stream_cli(self, cmd: List[str], use_shell: bool, timeout: int):
+        """
+        Gemini CLIを起動し、標準出力に届いたテキストを逐次返す
+        
+        Args:
+            cmd: 実行するコマンドと引数
+            use_shell: シェル経由で起動するか
+            timeout: タイムアウト（秒）
+            
+        Yields:
+            応答テキストの断片
+            
+        Returns:
+            (結果 "ok"/"missing"/"timeout"/"error", 出力があったか, エラーメッセージ)
+        """
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=None if self.debug else subprocess.PIPE,
+                shell=use_shell
+            )
+        except FileNotFoundError:
+            return "missing", False, ""
+        
+        # タイムアウト時はプロセスを強制終了（読み出しループはEOFで抜ける）
+        timed_out = threading.Event()
+        
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+        
+        watchdog = threading.Timer(timeout, kill_on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        
+        with self._process_lock:
+            self._active_processes.add(process)
+        
+        # 標準エラーは別スレッドで読み捨てる（パイプが埋まるとCLIが停止し、標準出力も閉じなくなる）
+        # エラーメッセージ用に末尾だけ保持する
+        stderr_tail = deque(maxlen=16)
+        stderr_reader = None
+        if process.stderr:
+            def drain_stderr():
+                for chunk in iter(lambda: process.stderr.read1(4096), b''):
+                    stderr_tail.append(chunk)
+            
+            stderr_reader = threading.Thread(target=drain_stderr, name="gemini-stderr", daemon=True)
+            stderr_reader.start()
+        
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        produced = False
+        try:
+            while True:
+                # 届いている分だけ読み出す（バッファが埋まるまで待たない）
+                data = process.stdout.read1(4096)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if text:
+                    produced = True
+                    yield text
+            
+            text = decoder.decode(b'', final=True)
+            if text:
+                produced = True
+                yield text
+            
+            process.wait()
+            if stderr_reader is not None:
+                stderr_reader.join(timeout=1.0)
+            if timed_out.is_set():
+                return "timeout", produced, ""
+            if process.returncode != 0:
+                return "error", produced, b''.join(stderr_tail).decode('utf-8', errors='ignore').strip()
+            return "ok", produced, ""
+        finally:
+            watchdog.cancel()
+            with self._process_lock:
+                self._active_processes.discard(process)
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+    
+    def close(self):
+        """ストリーミング中のCLIプロセスを停止（アシスタント終了時に呼び出す）"""
+        with self._process_lock:
+            processes = list(self._active_processes)
+        
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
     
     def test_connection(self) -> bool:
         """接続テストを実行"""
@@ -279,25 +519,17 @@ class GeminiClient:
             # 短い応答を促すプロンプト修正
             optimized_prompt = f"{prompt}\n（簡潔に答えてください。50文字以内で。）"
             
-            # コマンドを構築（タイムアウトを短縮）
-            cmd = ['gemini.cmd', '-m', self.model, '-p', optimized_prompt]
+            # コマンド引数を構築（タイムアウトを短縮）
+            args = ['-m', self.model, '-p', optimized_prompt]
             
             if self.debug:
-                cmd.append('-d')
-                print(f"デバッグ: 最適化コマンド = {' '.join(cmd)}")
+                args.append('-d')
+                print(f"デバッグ: 最適化引数 = {' '.join(args)}")
             
             print(f"📤 Geminiに最適化送信中: '{prompt}'")
             
             # 設定された最適化タイムアウトを使用
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore',
-                timeout=self.optimized_timeout,
-                shell=False
-            )
+            result = self._run_cli(args, self.optimized_timeout)
             
             if result.returncode == 0:
                 response = result.stdout.strip()
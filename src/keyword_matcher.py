@@ -0,0 +1,90 @@
+"""
+キーワード照合モジュール
+ウェイクワードなど複数キーワードを1回の走査で検索する
+"""
+
+import re
+from typing import Iterable, Optional, Tuple
+
+# Aho-Corasickオートマトン（オプション、未インストール時は正規表現で代替）
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordMatcher:
+    """複数キーワードを事前コンパイルして一括検索するクラス（大文字小文字を区別しない）"""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        初期化
+
+        Args:
+            keywords: 検索対象のキーワード
+        """
+        # 小文字化したキーワード → 元のキーワード（重複時は先勝ち）
+        self.keywords = {}
+        for keyword in keywords:
+            if keyword:
+                self.keywords.setdefault(keyword.lower(), keyword)
+
+        self._automaton = None
+        self._pattern = None
+
+        if not self.keywords:
+            return
+
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword_lower, keyword in self.keywords.items():
+                self._automaton.add_word(keyword_lower, (keyword_lower, keyword))
+            self._automaton.make_automaton()
+        else:
+            # 長いキーワードを優先（同じ開始位置では最長一致）
+            alternatives = sorted(self.keywords, key=len, reverse=True)
+            self._pattern = re.compile("|".join(re.escape(k) for k in alternatives))
+
+    def find_first(self, text: str, text_lower: Optional[str] = None) -> Optional[Tuple[int, int, str]]:
+        """
+        テキスト中で最も早く出現するキーワードを検索
+
+        Args:
+            text: 検索対象テキスト
+            text_lower: 小文字化済みのテキスト（呼び出し側で計算済みなら渡して再計算を省く）
+
+        Returns:
+            (開始位置, 終了位置, 元のキーワード)。見つからない場合はNone
+        """
+        if not text or not self.keywords:
+            return None
+
+        if text_lower is None:
+            text_lower = text.lower()
+
+        if self._automaton is not None:
+            best = None
+            for end_index, (keyword_lower, keyword) in self._automaton.iter(text_lower):
+                start = end_index - len(keyword_lower) + 1
+                # 開始位置が早いもの、同じなら長いものを優先
+                if best is None or start < best[0] or (start == best[0] and end_index + 1 > best[1]):
+                    best = (start, end_index + 1, keyword)
+            return best
+
+        match = self._pattern.search(text_lower)
+        if match is None:
+            return None
+        return match.start(), match.end(), self.keywords[match.group(0)]
+
+    def contains(self, text: str) -> bool:
+        """
+        いずれかのキーワードを含むか
+
+        Args:
+            text: 検索対象テキスト
+
+        Returns:
+            キーワードを含むかどうか
+        """
+        return self.find_first(text) is not None
@@ -164,6 +164,20 @@ class VoiceAssistantLogger:
         if self.session_logger:
             self.session_logger.error(msg)
     
+    def debug(self, msg: str, *args):
+        """
+        デバッグログ（メインログのみ、DEBUGレベル時だけ整形して出力）
+        
+        Args:
+            msg: %形式のメッセージ
+            args: メッセージの引数（出力時にのみ展開される）
+        """
+        self.main_logger.debug(msg, *args)
+    
+    def is_debug_enabled(self) -> bool:
+        """DEBUGレベルのログが出力されるか"""
+        return self.main_logger.isEnabledFor(logging.DEBUG)
+    
     def log_shutdown(self):
         """終了ログ"""
         msg = "音声アシスタント終了"
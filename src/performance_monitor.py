@@ -5,9 +5,13 @@
 
 import time
 import statistics
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, deque
+
+
+# 統計に保持する履歴数（常時稼働でも記録が増え続けないよう、古いものから破棄）
+MAX_SESSION_HISTORY = 256
 
 
 @dataclass
@@ -54,9 +58,9 @@ class PerformanceMonitor:
     """パフォーマンス監視クラス"""
     
     def __init__(self):
-        self.sessions: List[ProcessingSession] = []
+        self.sessions: Deque[ProcessingSession] = deque(maxlen=MAX_SESSION_HISTORY)
         self.current_session: Optional[ProcessingSession] = None
-        self.step_stats: Dict[str, List[float]] = defaultdict(list)
+        self.step_stats: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=MAX_SESSION_HISTORY))
         self.session_count = 0
     
     def start_session(self, context: str = "") -> str:
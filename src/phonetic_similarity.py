@@ -408,7 +408,6 @@ class PhoneticSimilarityCalculator:
         target_len = len(normalized_target)
         
         # 単語境界での区切り（スペース、句読点）
-        import re
         words = re.split(r'[\s、。，,]+', normalized_text)
         
         # 各単語との類似度をチェック
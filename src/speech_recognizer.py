@@ -22,6 +22,36 @@ except ImportError:
         PHONETIC_VERIFICATION_AVAILABLE = False
         print("⚠️ 音韻的類似度検証モジュールが見つかりません（オプション機能）")
 
+try:
+    from .keyword_matcher import KeywordMatcher
+except ImportError:
+    from keyword_matcher import KeywordMatcher
+
+# デフォルトのウェイクワード - アシスタント名「ルクス」
+DEFAULT_WAKE_WORDS = ("ルクス", "るくす", "Lux", "lux", "LUX")
+
+# 曖昧一致パターン（音声認識の誤認識対策）
+FUZZY_WAKE_WORDS = {
+    # 「ルクス」の誤認識されやすいパターン
+    "ラックス": ["ルクス", "るくす"],
+    "らっくす": ["ルクス", "るくす"],
+    "ルックス": ["ルクス", "るくす"],
+    "るっくす": ["ルクス", "るくす"],
+    "リクス": ["ルクス", "るくす"],      # 母音変化対応
+    "りくす": ["ルクス", "るくす"],
+    "ラクス": ["ルクス", "るくす"],      # よくある誤認識
+    "らくす": ["ルクス", "るくす"],
+    # 特殊な誤認識パターン（「おはようルクス」→「おはようございます」など）
+    "ございます": ["ルクス", "るくす"],   # 重要：敬語への誤変換対策
+    "おはようございます": ["おはようルクス", "おはようるくす"],
+    "こんにちは": ["ルクス", "るくす"],   # 挨拶の誤認識対策
+    "ありがとうございます": ["ルクス", "るくす"],  # 敬語誤認識対策
+    # 英語パターン
+    "luck": ["Lux", "lux"],
+    "LUCK": ["Lux", "LUX"],
+    "lacks": ["Lux", "lux"],
+}
+
 
 class SpeechRecognizer:
     """音声認識を管理するクラス"""
@@ -56,6 +86,10 @@ class SpeechRecognizer:
                 print(f"⚠️ 音韻的類似度検証の初期化に失敗: {e}")
                 self.enable_phonetic_verification = False
         
+        # ウェイクワード照合器（ウェイクワードの組み合わせごとに1度だけ構築）
+        self._wake_word_matchers = {}
+        self._fuzzy_matcher = KeywordMatcher(FUZZY_WAKE_WORDS)
+        
         print(f"音声認識初期化完了: 言語={language}, 音韻検証={self.enable_phonetic_verification}")
     
     def recognize_from_audio_data(self, audio_data: np.ndarray, 
@@ -168,10 +202,7 @@ class SpeechRecognizer:
             (ウェイクワードが検知されたか, 抽出されたコマンド)
         """
         if wake_words is None:
-            # デフォルトのウェイクワード - アシスタント名「ルクス」
-            wake_words = [
-                "ルクス", "るくす", "Lux", "lux", "LUX"
-            ]
+            wake_words = DEFAULT_WAKE_WORDS
         
         if not text:
             return False, ""
@@ -193,40 +224,20 @@ class SpeechRecognizer:
                 return self._extract_command_after_wake_word(correct, "ルクス")
         
         # 1. 完全一致チェック
-        for wake_word in wake_words:
-            wake_word_lower = wake_word.lower()
-            if wake_word_lower in text_lower:
-                print(f"ウェイクワード検知（完全一致）: '{wake_word}' in '{text}'")
-                return self._extract_command_after_wake_word(text, wake_word)
+        match = self._get_wake_word_matcher(wake_words).find_first(text, text_lower)
+        if match is not None:
+            wake_word = match[2]
+            print(f"ウェイクワード検知（完全一致）: '{wake_word}' in '{text}'")
+            return self._command_after_match(text, match)
         
         # 2. 曖昧一致チェック（音声認識の誤認識対策）
-        fuzzy_matches = {
-            # 「ルクス」の誤認識されやすいパターン
-            "ラックス": ["ルクス", "るくす"],
-            "らっくす": ["ルクス", "るくす"],  
-            "ルックス": ["ルクス", "るくす"],
-            "るっくす": ["ルクス", "るくす"],
-            "リクス": ["ルクス", "るくす"],      # 母音変化対応
-            "りくす": ["ルクス", "るくす"],
-            "ラクス": ["ルクス", "るくす"],      # よくある誤認識
-            "らくす": ["ルクス", "るくす"],
-            # 特殊な誤認識パターン（「おはようルクス」→「おはようございます」など）
-            "ございます": ["ルクス", "るくす"],   # 重要：敬語への誤変換対策
-            "おはようございます": ["おはようルクス", "おはようるくす"],
-            "こんにちは": ["ルクス", "るくす"],   # 挨拶の誤認識対策
-            "ありがとうございます": ["ルクス", "るくす"],  # 敬語誤認識対策
-            # 英語パターン
-            "luck": ["Lux", "lux"],
-            "LUCK": ["Lux", "LUX"],
-            "lacks": ["Lux", "lux"],
-        }
-        
-        for recognized_word, possible_wake_words in fuzzy_matches.items():
-            if recognized_word.lower() in text_lower:
-                # 対応するウェイクワードの中から最初のものを使用
-                matched_wake_word = possible_wake_words[0]
-                print(f"ウェイクワード検知（曖昧一致）: '{recognized_word}' → '{matched_wake_word}' in '{text}'")
-                return self._extract_command_after_wake_word(text, recognized_word)
+        match = self._fuzzy_matcher.find_first(text, text_lower)
+        if match is not None:
+            recognized_word = match[2]
+            # 対応するウェイクワードの中から最初のものを使用
+            matched_wake_word = FUZZY_WAKE_WORDS[recognized_word][0]
+            print(f"ウェイクワード検知（曖昧一致）: '{recognized_word}' → '{matched_wake_word}' in '{text}'")
+            return self._command_after_match(text, match)
         
         # 3. 音韻的類似度検証によるチェック
         if self.enable_phonetic_verification and self.phonetic_verifier:
@@ -247,6 +258,34 @@ class SpeechRecognizer:
         
         return False, ""
     
+    def _get_wake_word_matcher(self, wake_words) -> KeywordMatcher:
+        """ウェイクワードリストに対応する照合器を取得（初回のみ構築）"""
+        key = tuple(wake_words)
+        matcher = self._wake_word_matchers.get(key)
+        if matcher is None:
+            matcher = KeywordMatcher(key)
+            self._wake_word_matchers[key] = matcher
+        return matcher
+    
+    def _command_after_match(self, text: str, match: tuple) -> tuple[bool, str]:
+        """
+        照合結果の終了位置以降をコマンドとして抽出
+        
+        Args:
+            text: 認識されたテキスト
+            match: KeywordMatcher.find_firstの結果
+            
+        Returns:
+            (True, 抽出されたコマンド)
+        """
+        command = text[match[1]:].strip()
+        
+        # 句読点や接続詞を除去
+        command = command.lstrip('、。，,')
+        
+        print(f"抽出されたコマンド: '{command}'")
+        return True, command
+    
     def _extract_command_after_wake_word(self, text: str, wake_word: str) -> tuple[bool, str]:
         """
         ウェイクワード後のコマンドを抽出するヘルパーメソッド
@@ -254,15 +293,11 @@ class SpeechRecognizer:
         text_lower = text.lower()
         wake_word_lower = wake_word.lower()
         
-        # ウェイクワードの位置を特定
-        wake_word_positions = []
-        for i in range(len(text)):
-            if text[i:i+len(wake_word)].lower() == wake_word_lower:
-                wake_word_positions.append(i)
+        # 最初に見つかったウェイクワードの位置を使用
+        wake_word_index = text_lower.find(wake_word_lower)
         
-        if wake_word_positions:
-            # 最初に見つかったウェイクワードの位置を使用
-            wake_word_end = wake_word_positions[0] + len(wake_word)
+        if wake_word_index >= 0:
+            wake_word_end = wake_word_index + len(wake_word)
             command = text[wake_word_end:].strip()
             
             # 句読点や接続詞を除去
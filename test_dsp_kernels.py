@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+音声信号処理カーネル（無音区間検出）のテストスクリプト
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import dsp_kernels
+from dsp_kernels import find_voiced_bounds, frame_energy, has_silent_run, pcm16_with_rms
+
+
+def test_find_voiced_bounds():
+    """有音区間検出のテスト"""
+    print(f"🔍 無音区間検出のテストを開始 (Numba: {dsp_kernels.NUMBA_AVAILABLE})")
+
+    sample_rate = 16000
+    window = sample_rate // 100  # 10ms
+
+    # 0.2秒無音 + 0.5秒正弦波 + 0.3秒無音
+    tone = (3000 * np.sin(2 * np.pi * 440 * np.arange(sample_rate // 2) / sample_rate)).astype(np.int16)
+    samples = np.concatenate([
+        np.zeros(sample_rate // 5, dtype=np.int16),
+        tone,
+        np.zeros(sample_rate * 3 // 10, dtype=np.int16),
+    ])
+
+    all_passed = True
+
+    bounds = find_voiced_bounds(samples, window, 200)
+    tone_start, tone_end = sample_rate // 5, sample_rate // 5 + len(tone)
+    passed = (bounds is not None
+              and abs(bounds[0] - tone_start) <= window
+              and abs(bounds[1] - tone_end) <= window)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} 有音区間: {bounds} (期待値: 約{(tone_start, tone_end)})")
+
+    passed = find_voiced_bounds(np.zeros(sample_rate, dtype=np.int16), window, 200) is None
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} 無音のみ → None")
+
+    passed = find_voiced_bounds(np.zeros(window // 2, dtype=np.int16), window, 200) is None
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} 窓幅より短い入力 → None")
+
+    # NumPy実装とJIT実装の結果一致
+    if dsp_kernels.NUMBA_AVAILABLE:
+        expected = dsp_kernels._voiced_bounds_numpy(samples, window, 200.0)
+        actual = dsp_kernels._voiced_bounds_jit(samples, window, 200.0)
+        passed = tuple(expected) == tuple(actual)
+        all_passed = all_passed and passed
+        print(f"{'✅' if passed else '❌'} NumPy実装とNumba実装の一致: {expected} / {actual}")
+
+    print("🎯 無音区間検出のテスト完了" if all_passed else "❌ 失敗したテストがあります")
+    return all_passed
+
+
+def test_frame_energy():
+    """フレームRMS計算のテスト"""
+    print("🔍 フレームRMS計算のテストを開始")
+
+    all_passed = True
+
+    # 振幅一定の信号はRMS = 振幅（int16の二乗でも桁あふれしない）
+    buf = np.full(480 * 4, 20000, dtype=np.int16)
+    rms = frame_energy(buf, 480, 480)
+    passed = len(rms) == 4 and np.allclose(rms, 20000, rtol=1e-3)
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} 一定振幅: {rms}")
+
+    # hopがフレーム長より短い場合のフレーム数
+    rms = frame_energy(np.arange(10, dtype=np.int16), 4, 2)
+    passed = len(rms) == 4
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} フレーム数 (10サンプル, 長さ4, 移動2): {len(rms)}")
+
+    passed = len(frame_energy(np.zeros(3, dtype=np.int16), 4, 4)) == 0
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} フレーム長未満 → 空配列")
+
+    print("🎯 フレームRMS計算のテスト完了" if all_passed else "❌ 失敗したテストがあります")
+    return all_passed
+
+
+def test_pcm16_with_rms():
+    """int16変換・RMS同時計算のテスト"""
+    print("🔍 int16変換・RMS同時計算のテストを開始")
+
+    all_passed = True
+
+    samples = np.array([0.5, -0.5, 0.5, -0.5, 1.5, -1.5], dtype=np.float32)
+    out = np.zeros(8, dtype=np.int16)
+    rms = pcm16_with_rms(samples, out)
+    expected_rms = float(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
+    passed = abs(rms - expected_rms) < 1e-4
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} RMS: {rms:.4f} (期待値: {expected_rms:.4f})")
+
+    expected_pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    passed = np.array_equal(out[:len(samples)], expected_pcm) and not out[len(samples):].any()
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} int16変換（範囲外はクリップ）: {out[:len(samples)]}")
+
+    passed = pcm16_with_rms(np.zeros(0, dtype=np.float32), out) == 0.0
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} 空入力 → 0.0")
+
+    print("🎯 int16変換・RMS同時計算のテスト完了" if all_passed else "❌ 失敗したテストがあります")
+    return all_passed
+
+
+def test_has_silent_run():
+    """無音区間の連続判定のテスト"""
+    print("🔍 無音区間の連続判定のテストを開始")
+
+    all_passed = True
+    frame = 1600  # 0.1秒
+
+    # 0.5秒の音 + 0.3秒の無音 + 0.5秒の音
+    tone = np.full(frame * 5, 0.1, dtype=np.float32)
+    samples = np.concatenate([tone, np.zeros(frame * 3, dtype=np.float32), tone])
+    cases = [
+        ("無音3フレーム・必要3フレーム", samples, 3, True),
+        ("無音3フレーム・必要4フレーム", samples, 4, False),
+        ("末尾の端数も1フレームとして判定", np.concatenate([tone, np.zeros(frame + 10, dtype=np.float32)]), 2, True),
+        ("無音なし", tone, 1, False),
+    ]
+    for label, data, min_frames, expected in cases:
+        result = has_silent_run(data, frame, 0.01, min_frames)
+        passed = result == expected
+        all_passed = all_passed and passed
+        print(f"{'✅' if passed else '❌'} {label}: {result}")
+
+        # NumPy実装とJIT実装の結果一致
+        if dsp_kernels.NUMBA_AVAILABLE:
+            numpy_result = dsp_kernels._has_silent_run_numpy(data, frame, 0.01, min_frames)
+            jit_result = bool(dsp_kernels._has_silent_run_jit(data, frame, 0.01, min_frames))
+            passed = numpy_result == jit_result == expected
+            all_passed = all_passed and passed
+            print(f"{'✅' if passed else '❌'} NumPy実装とNumba実装の一致: {numpy_result} / {jit_result}")
+
+    print("🎯 無音区間の連続判定のテスト完了" if all_passed else "❌ 失敗したテストがあります")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = test_find_voiced_bounds()
+    success = test_frame_energy() and success
+    success = test_pcm16_with_rms() and success
+    success = test_has_silent_run() and success
+    sys.exit(0 if success else 1)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+キーワード照合（ウェイクワード検索）のテストスクリプト
+"""
+
+import sys
+import os
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from keyword_matcher import KeywordMatcher
+
+
+def test_keyword_matcher():
+    """KeywordMatcherの基本動作テスト"""
+    print("🔍 キーワード照合のテストを開始")
+
+    matcher = KeywordMatcher(["ルクス", "るくす", "Lux", "lux", "LUX"])
+
+    # (テキスト, 期待するキーワード, 期待するコマンド部分)
+    test_cases = [
+        ("ルクス 電気をつけて", "ルクス", "電気をつけて"),
+        ("ねえるくす、今何時", "るくす", "今何時"),
+        ("Hey LUX what time", "Lux", "what time"),
+        ("今日はいい天気", None, None),
+        ("", None, None),
+    ]
+
+    all_passed = True
+    for text, expected_keyword, expected_command in test_cases:
+        match = matcher.find_first(text)
+        if expected_keyword is None:
+            passed = match is None
+        else:
+            passed = (match is not None and match[2] == expected_keyword
+                      and text[match[1]:].strip().lstrip('、。，,') == expected_command)
+        all_passed = all_passed and passed
+        print(f"{'✅' if passed else '❌'} '{text}' → {match}")
+
+    # 最も早く出現するキーワードを返す
+    matcher = KeywordMatcher(["くす", "ルクス"])
+    match = matcher.find_first("ルクスとくす")
+    passed = match == (0, 3, "ルクス")
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} 最初の出現位置: {match}")
+
+    # 空のキーワードリスト
+    passed = not KeywordMatcher([]).contains("ルクス")
+    all_passed = all_passed and passed
+    print(f"{'✅' if passed else '❌'} 空のキーワードリスト")
+
+    print("🎯 キーワード照合のテスト完了" if all_passed else "❌ 失敗したテストがあります")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = test_keyword_matcher()
+    sys.exit(0 if success else 1)